@@ -0,0 +1,516 @@
+#!/usr/bin/env python3
+"""
+Stage a copy of a project datastore into a sandbox directory.
+
+The source is walked once, collecting every file's size and mtime, which also
+gives the datastore's total size. Files are then copied on a pool of threads,
+and a file already staged with the same size and mtime is left alone, so
+repeated sandbox sessions only copy what changed since the last one. Staged
+files that were removed from the source are removed from the sandbox; files
+created in the sandbox are never touched.
+
+When the datastore is larger than --large-datastore-gb, files bigger than
+--max-file-mb are skipped and listed instead, except those referenced by name
+in the code under --prefetch-from (usually the repository being sandboxed).
+With --lazy, each skipped file gets a small placeholder, <name>.placeholder.json,
+and --fetch materializes it on demand; fetched files are kept up to date by
+later runs like any other staged file.
+
+Files are staged with --mode:
+- reflink: copy-on-write clones (APFS, Btrfs, XFS), which take no extra disk
+  until the sandbox changes them
+- hardlink: hard links to the originals, made read-only so the sandbox cannot
+  change them in place. A hard link shares the original's permissions, so the
+  originals are read-only too while they are staged this way. Their modes are
+  saved in the stage record and restored when a file is staged another way or
+  removed, and for all of them by --teardown, which also removes the links.
+- copy: ordinary copies
+- auto (default): reflink where the filesystem supports it, otherwise copy
+Any file that cannot be staged with the chosen method is copied.
+
+Usage:
+    python3 stage_datastore.py SOURCE DEST
+    python3 stage_datastore.py SOURCE DEST --workers 16
+    python3 stage_datastore.py SOURCE DEST --mode hardlink
+    python3 stage_datastore.py SOURCE DEST --dry-run
+    python3 stage_datastore.py SOURCE DEST --lazy --prefetch-from REPO
+    python3 stage_datastore.py --fetch DEST/path/to/big_file.dta
+    python3 stage_datastore.py --teardown DEST     # Remove hard links, restore the originals' modes
+"""
+import os
+import sys
+import json
+import stat
+import errno
+import fcntl
+import shutil
+import ctypes
+import argparse
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+DEFAULT_WORKERS = 8
+DEFAULT_LARGE_DATASTORE_GB = 50
+DEFAULT_MAX_FILE_MB = 100
+
+# Record of what was staged, kept in the sandbox directory
+STAGE_FILE_NAME = ".datastore_stage.json"
+PLACEHOLDER_SUFFIX = ".placeholder.json"
+
+# Files searched for references to large datastore files
+CODE_EXTENSIONS = {".py", ".ipynb", ".r", ".rmd", ".qmd", ".do", ".ado", ".jl", ".m", ".sas", ".sql",
+                   ".sh", ".yaml", ".yml", ".toml", ".json", ".tex", ".md"}
+MAX_CODE_FILE_BYTES = 5 * 1024 ** 2
+
+MODES = ["auto", "reflink", "hardlink", "copy"]
+
+# Linux ioctl that clones one file's extents into another
+FICLONE = 0x40049409
+WRITE_BITS = stat.S_IWUSR | stat.S_IWGRP | stat.S_IWOTH
+# Errors meaning a reflink or hard link is impossible here, as opposed to a failed read
+UNSUPPORTED_ERRORS = {errno.EOPNOTSUPP, errno.ENOTSUP, errno.EXDEV, errno.EINVAL, errno.ENOTTY,
+                      errno.EPERM, errno.EMLINK}
+
+
+def human_readable(size_bytes):
+    for unit in ["B", "KB", "MB", "GB", "TB"]:
+        if abs(size_bytes) < 1024.0:
+            return f"{size_bytes:.1f} {unit}"
+        size_bytes /= 1024.0
+    return f"{size_bytes:.1f} PB"
+
+
+def scan_source(source):
+    """Walk source once; returns ({relpath: (size, mtime_ns)}, {relpath: link target}, [relative dirs])"""
+    files = {}
+    links = {}
+    dirs = []
+    stack = [""]
+    while stack:
+        relative = stack.pop()
+        try:
+            with os.scandir(os.path.join(source, relative)) as entries:
+                for entry in entries:
+                    path = os.path.join(relative, entry.name)
+                    if entry.is_symlink():
+                        links[path] = os.readlink(entry.path)
+                    elif entry.is_dir():
+                        dirs.append(path)
+                        stack.append(path)
+                    else:
+                        stat = entry.stat()
+                        files[path] = (stat.st_size, stat.st_mtime_ns)
+        except OSError as e:
+            print(f"⚠️  Cannot read {os.path.join(source, relative)}: {e}", file=sys.stderr)
+    return files, links, dirs
+
+
+def is_staged(path, size, mtime_ns):
+    """Whether path already holds a copy with the given size and mtime"""
+    try:
+        stat = os.stat(path, follow_symlinks=False)
+    except OSError:
+        return False
+    return stat.st_size == size and stat.st_mtime_ns == mtime_ns
+
+
+def copy_file(source, destination):
+    """Copy one file, keeping its mtime so later runs can tell it is unchanged"""
+    shutil.copy2(source, destination)
+
+
+def reflink_file(source, destination):
+    """Clone a file copy-on-write, keeping its mtime; raises OSError where unsupported"""
+    if sys.platform == "darwin":
+        libc = ctypes.CDLL(None, use_errno=True)
+        # clonefile(2) copies the metadata, mtime included
+        if libc.clonefile(os.fsencode(source), os.fsencode(destination), 0) != 0:
+            error = ctypes.get_errno()
+            raise OSError(error, os.strerror(error), destination)
+        return
+    if not sys.platform.startswith("linux"):
+        raise OSError(errno.EOPNOTSUPP, "reflinks are not supported on this platform", destination)
+    with open(source, "rb") as src, open(destination, "wb") as dst:
+        try:
+            fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+        except OSError:
+            dst.close()
+            os.remove(destination)
+            raise
+    shutil.copystat(source, destination)
+
+
+def hardlink_file(source, destination):
+    """Hard link a file and make it (and so the original) read-only; returns the original mode"""
+    os.link(source, destination)
+    mode = stat.S_IMODE(os.stat(destination).st_mode)
+    try:
+        os.chmod(destination, mode & ~WRITE_BITS)
+    except OSError:
+        # An unprotected link would let the sandbox change the original
+        os.remove(destination)
+        raise
+    return mode
+
+
+def restore_mode(source, mode):
+    """Give an original the mode it had before hard linking made it read-only.
+
+    Only done if the file still has exactly the mode staging gave it, so a file
+    replaced or re-permissioned since is left alone.
+    """
+    try:
+        if stat.S_IMODE(os.stat(source).st_mode) == mode & ~WRITE_BITS:
+            os.chmod(source, mode)
+    except OSError:
+        pass
+
+
+class Stager:
+    """Stages files with the chosen method, falling back to copies.
+
+    After the first file the method cannot handle for lack of filesystem
+    support, the rest are copied without trying it again.
+    """
+
+    methods = {"reflink": reflink_file, "hardlink": hardlink_file, "copy": copy_file}
+
+    def __init__(self, mode="auto", original_modes=None):
+        self.method = "reflink" if mode == "auto" else mode
+        self.supported = True
+        self.counts = Counter()
+        self.lock = threading.Lock()
+        # {source path: mode} of originals made read-only by hard linking
+        self.original_modes = dict(original_modes or {})
+
+    def stage(self, source, destination):
+        """Stage one file, replacing whatever is at destination; returns the method used"""
+        # Never write into an existing file: it may be a hard link to an original
+        if os.path.lexists(destination):
+            os.remove(destination)
+        # With the link gone, the original can have its write permission back
+        # (and a copy of it gets the original's mode, not the read-only one)
+        with self.lock:
+            original_mode = self.original_modes.pop(os.path.abspath(source), None)
+        if original_mode is not None:
+            restore_mode(source, original_mode)
+
+        used = "copy"
+        if self.method != "copy" and self.supported:
+            try:
+                result = self.methods[self.method](source, destination)
+                used = self.method
+                if used == "hardlink":
+                    with self.lock:
+                        self.original_modes[os.path.abspath(source)] = result
+            except OSError as e:
+                if e.errno not in UNSUPPORTED_ERRORS:
+                    raise
+                if e.errno != errno.EMLINK:
+                    self.supported = False
+        if used == "copy":
+            copy_file(source, destination)
+
+        with self.lock:
+            self.counts[used] += 1
+        return used
+
+
+def load_stage_record(destination):
+    path = Path(destination) / STAGE_FILE_NAME
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text())
+
+
+def save_stage_record(destination, record):
+    path = Path(destination) / STAGE_FILE_NAME
+    temp = path.with_suffix(".tmp")
+    temp.write_text(json.dumps(record))
+    temp.replace(path)
+
+
+def original_modes(record):
+    """{source path: mode} for the originals a stage record says are hard linked read-only"""
+    source = record.get("source", "")
+    return {os.path.abspath(os.path.join(source, path)): mode
+            for path, mode in record.get("original_modes", {}).items()}
+
+
+def relative_modes(modes, source):
+    return {os.path.relpath(path, os.path.abspath(source)): mode for path, mode in modes.items()}
+
+
+def teardown(destination):
+    """Remove hard-linked files from a sandbox and restore their originals' modes; returns how many"""
+    record = load_stage_record(destination)
+    source = record.get("source", "")
+    modes = record.get("original_modes", {})
+    for path, mode in modes.items():
+        try:
+            os.remove(os.path.join(destination, path))
+        except OSError:
+            pass
+        restore_mode(os.path.join(source, path), mode)
+        record.get("files", {}).pop(path, None)
+    record["original_modes"] = {}
+    if record:
+        save_stage_record(destination, record)
+    return len(modes)
+
+
+def staged_method(record, path):
+    """How a file in the stage record was staged; older records only hold copies"""
+    entry = record.get(path, [])
+    return entry[2] if len(entry) > 2 else "copy"
+
+
+def find_references(code_dir, paths, exclude=None):
+    """The datastore paths whose relative path or file name appears in a code file under code_dir"""
+    names = {path: (path.replace(os.sep, "/"), os.path.basename(path)) for path in paths}
+    exclude = os.path.realpath(exclude) if exclude else None
+    referenced = set()
+    for root, dirnames, filenames in os.walk(code_dir):
+        dirnames[:] = [d for d in dirnames if not d.startswith(".")
+                       and os.path.realpath(os.path.join(root, d)) != exclude]
+        for filename in filenames:
+            if os.path.splitext(filename)[1].lower() not in CODE_EXTENSIONS:
+                continue
+            path = os.path.join(root, filename)
+            try:
+                if os.path.getsize(path) > MAX_CODE_FILE_BYTES:
+                    continue
+                with open(path, errors="replace") as f:
+                    text = f.read()
+            except OSError:
+                continue
+            for datastore_path, (relative, basename) in names.items():
+                if relative in text or basename in text:
+                    referenced.add(datastore_path)
+    return referenced
+
+
+def write_placeholder(source, destination, path, size, mtime_ns):
+    placeholder = os.path.join(destination, path) + PLACEHOLDER_SUFFIX
+    Path(placeholder).write_text(json.dumps({
+        "placeholder_for": path,
+        "source": os.path.join(os.path.abspath(source), path),
+        "size": size,
+        "mtime_ns": mtime_ns,
+        "fetch": f"python3 {os.path.abspath(__file__)} --fetch {placeholder}",
+    }, indent=2))
+
+
+def fetch(placeholder, mode="auto"):
+    """Materialize the file a placeholder stands for and record it as staged; returns its path"""
+    if not placeholder.endswith(PLACEHOLDER_SUFFIX):
+        placeholder += PLACEHOLDER_SUFFIX
+    info = json.loads(Path(placeholder).read_text())
+    target = placeholder[:-len(PLACEHOLDER_SUFFIX)]
+    destination = target[:-len(info["placeholder_for"])] or "."
+
+    record = load_stage_record(destination)
+    source = record.get("source") or info["source"][:-len(info["placeholder_for"])]
+    stager = Stager(mode, original_modes(record))
+    method = stager.stage(info["source"], target)
+    os.remove(placeholder)
+
+    staged = os.stat(target)
+    record.setdefault("files", {})[info["placeholder_for"]] = [staged.st_size, staged.st_mtime_ns, method]
+    record["original_modes"] = relative_modes(stager.original_modes, source)
+    record["fetched"] = sorted(set(record.get("fetched", [])) | {info["placeholder_for"]})
+    record["placeholders"] = [p for p in record.get("placeholders", []) if p != info["placeholder_for"]]
+    save_stage_record(destination, record)
+    return target, method
+
+
+def stage_datastore(source, destination, workers=DEFAULT_WORKERS, large_datastore_bytes=None,
+                    max_file_bytes=None, mode="auto", lazy=False, prefetch_from=None, dry_run=False):
+    """Bring destination up to date with source; returns a summary dict"""
+    files, links, dirs = scan_source(source)
+    total = sum(size for size, _ in files.values())
+    print(f"📂 {len(files):,} files, {human_readable(total)} in {source}", flush=True)
+
+    record = load_stage_record(destination)
+    skipped = {}
+    if large_datastore_bytes is not None and total >= large_datastore_bytes and max_file_bytes is not None:
+        skipped = {path: size for path, (size, _) in files.items() if size > max_file_bytes}
+        print(f"📏 Datastore is over {human_readable(large_datastore_bytes)}; "
+              f"{len(skipped):,} files are over {human_readable(max_file_bytes)}", flush=True)
+
+    # Large files fetched earlier or used by the code are staged like the rest
+    prefetch = set(record.get("fetched", [])) & set(skipped)
+    if skipped and prefetch_from:
+        prefetch |= find_references(prefetch_from, skipped, exclude=destination)
+    if prefetch:
+        print(f"🎯 Staging {len(prefetch):,} of them that were fetched before or are referenced in the code",
+              flush=True)
+        skipped = {path: size for path, size in skipped.items() if path not in prefetch}
+
+    wanted = {path: stat for path, stat in files.items() if path not in skipped}
+    previous = record.get("files", {})
+
+    def up_to_date(path):
+        size, mtime_ns = wanted[path]
+        if not is_staged(os.path.join(destination, path), size, mtime_ns):
+            return False
+        # Hard links are only kept while hardlink mode is asked for
+        return staged_method(previous, path) != "hardlink" or mode == "hardlink"
+
+    todo = [path for path in wanted if not up_to_date(path)]
+    todo_bytes = sum(wanted[path][0] for path in todo)
+
+    # Files staged by an earlier run that are gone from the source (or now skipped)
+    removed = [path for path in previous if path not in wanted]
+
+    print(f"🔁 {len(wanted) - len(todo):,} files already staged, "
+          f"{len(todo):,} to copy ({human_readable(todo_bytes)}), {len(removed):,} to remove", flush=True)
+    if dry_run:
+        for path in sorted(todo):
+            print(f"  copy {path}")
+        for path in sorted(removed):
+            print(f"  remove {path}")
+        if lazy:
+            print(f"  {len(skipped):,} placeholders")
+        return {"copied": 0, "copied_bytes": 0, "failed": [], "skipped": skipped, "methods": {}}
+
+    os.makedirs(destination, exist_ok=True)
+    for path in dirs:
+        os.makedirs(os.path.join(destination, path), exist_ok=True)
+    for path, target in links.items():
+        link = os.path.join(destination, path)
+        if not os.path.islink(link) or os.readlink(link) != target:
+            if os.path.lexists(link):
+                os.remove(link)
+            os.symlink(target, link)
+    stager = Stager(mode, original_modes(record))
+    for path in removed:
+        try:
+            os.remove(os.path.join(destination, path))
+        except OSError:
+            pass
+        original_mode = stager.original_modes.pop(os.path.abspath(os.path.join(source, path)), None)
+        if original_mode is not None:
+            restore_mode(os.path.join(source, path), original_mode)
+
+    # Placeholders for files that are now staged, gone or no longer lazy
+    placeholders = sorted(skipped) if lazy else []
+    for path in set(record.get("placeholders", [])) - set(placeholders):
+        try:
+            os.remove(os.path.join(destination, path) + PLACEHOLDER_SUFFIX)
+        except OSError:
+            pass
+    for path in placeholders:
+        write_placeholder(source, destination, path, *files[path])
+
+    def work(path):
+        try:
+            return path, stager.stage(os.path.join(source, path), os.path.join(destination, path)), None
+        except OSError as e:
+            return path, None, e
+
+    # {path: [size, mtime_ns, method]}, carrying over files that were already staged
+    staged = {path: list(stat) + [staged_method(previous, path)] for path, stat in wanted.items()}
+    failed = []
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for path, method, error in executor.map(work, todo):
+            if error is not None:
+                failed.append(path)
+                del staged[path]
+                print(f"  ✗ {path}: {error}", file=sys.stderr)
+            else:
+                staged[path] = list(wanted[path]) + [method]
+
+    save_stage_record(destination, {
+        "source": os.path.abspath(source),
+        "files": staged,
+        "fetched": sorted(set(record.get("fetched", [])) & set(files)),
+        "placeholders": placeholders,
+        "original_modes": relative_modes(stager.original_modes, source),
+    })
+    return {
+        "copied": len(todo) - len(failed),
+        "copied_bytes": todo_bytes - sum(wanted[path][0] for path in failed),
+        "failed": failed,
+        "skipped": skipped,
+        "methods": dict(stager.counts),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stage a copy of a datastore into a sandbox directory")
+    parser.add_argument("source", nargs="?", help="Datastore to copy")
+    parser.add_argument("destination", nargs="?", help="Sandbox directory to stage it in")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS,
+                        help=f"Number of copy threads (default: {DEFAULT_WORKERS})")
+    parser.add_argument("--large-datastore-gb", type=float, default=DEFAULT_LARGE_DATASTORE_GB,
+                        help=f"Datastores at least this large skip big files (default: {DEFAULT_LARGE_DATASTORE_GB})")
+    parser.add_argument("--max-file-mb", type=float, default=DEFAULT_MAX_FILE_MB,
+                        help=f"Largest file copied from a large datastore, in MB (default: {DEFAULT_MAX_FILE_MB})")
+    parser.add_argument("--mode", choices=MODES, default="auto",
+                        help="How files are staged: reflink, hardlink, copy or auto (default: auto)")
+    parser.add_argument("--lazy", action="store_true",
+                        help="Leave a placeholder for each large file that is not copied")
+    parser.add_argument("--prefetch-from", metavar="DIR",
+                        help="Also stage large files whose names appear in the code under DIR")
+    parser.add_argument("--fetch", nargs="+", metavar="PLACEHOLDER",
+                        help="Materialize the files these placeholders stand for and exit")
+    parser.add_argument("--teardown", metavar="DEST",
+                        help="Remove hard-linked files from DEST, restore their originals' modes and exit")
+    parser.add_argument("--dry-run", action="store_true", help="Show what would be copied without copying")
+
+    args = parser.parse_args()
+
+    if args.teardown:
+        count = teardown(args.teardown)
+        print(f"✅ Removed {count:,} hard-linked files from {args.teardown} and restored their originals' modes")
+        return
+
+    if args.fetch:
+        for placeholder in args.fetch:
+            try:
+                target, method = fetch(placeholder, args.mode)
+            except (OSError, ValueError, KeyError) as e:
+                print(f"❌ Could not fetch {placeholder}: {e}", file=sys.stderr)
+                sys.exit(1)
+            print(f"✅ Fetched {target} by {method}")
+        return
+
+    if not args.source or not args.destination:
+        parser.error("source and destination are required unless --fetch or --teardown is given")
+
+    if not os.path.isdir(args.source):
+        print(f"Error: Datastore not found at {args.source}", file=sys.stderr)
+        sys.exit(1)
+
+    summary = stage_datastore(
+        args.source, args.destination, workers=args.workers,
+        large_datastore_bytes=int(args.large_datastore_gb * 1024 ** 3),
+        max_file_bytes=int(args.max_file_mb * 1024 ** 2), mode=args.mode, lazy=args.lazy,
+        prefetch_from=args.prefetch_from, dry_run=args.dry_run,
+    )
+
+    if summary["skipped"]:
+        if args.lazy:
+            print("\n💤 Large files left as placeholders:")
+        else:
+            print("\n⚠️  Large files not copied:")
+        for path, size in sorted(summary["skipped"].items(), key=lambda item: item[1], reverse=True):
+            print(f"  {human_readable(size)}\t{path}")
+        if args.lazy:
+            print(f"Fetch one with: python3 {sys.argv[0]} --fetch "
+                  f"{os.path.join(args.destination, '<path>')}{PLACEHOLDER_SUFFIX}")
+
+    if not args.dry_run:
+        methods = ", ".join(f"{count:,} by {method}" for method, count in sorted(summary["methods"].items()))
+        print(f"\n✅ Staged {summary['copied']:,} files ({human_readable(summary['copied_bytes'])}) "
+              f"to {args.destination}{f': {methods}' if methods else ''}")
+    if summary["failed"]:
+        print(f"❌ {len(summary['failed'])} files could not be copied", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
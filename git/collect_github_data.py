@@ -8,6 +8,7 @@ import subprocess
 import sys
 import os
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
 
@@ -36,6 +37,12 @@ REPOS = [
     "MaxMillerLab/peps"
 ]
 
+# gh pages through project lists with GraphQL cursors until it reaches --limit;
+# the limit is raised to the reported totalCount whenever there are more
+DEFAULT_LIST_LIMIT = 1000
+# Projects whose items are collected at the same time
+MAX_PARALLEL_PROJECTS = 4
+
 
 def run_gh_command(cmd):
     """Run a GitHub CLI command and return parsed JSON output"""
@@ -51,6 +58,27 @@ def run_gh_command(cmd):
         return None
 
 
+def run_gh_list(cmd, key, expected=None):
+    """Run a gh project list command and return every entry under key.
+
+    The --limit is the larger of DEFAULT_LIST_LIMIT and the expected count. If gh
+    reports a larger totalCount than it returned (e.g. items were added since the
+    count was taken), the command is rerun once with that count as the limit.
+    Returns (entries, total count), or (None, None) if the command failed.
+    """
+    limit = max(expected or 0, DEFAULT_LIST_LIMIT)
+    for attempt in range(2):
+        data = run_gh_command(cmd + ["--limit", str(limit)])
+        if data is None:
+            return None, None
+        entries = data.get(key, [])
+        total = max(data.get('totalCount', len(entries)), expected or 0)
+        if len(entries) >= total:
+            break
+        limit = total
+    return entries, total
+
+
 def collect_issues_for_repo(repo_name):
     """Get all open issues for a repository with full metadata"""
     print(f"  Collecting issues for {repo_name}...", file=sys.stderr)
@@ -76,30 +104,34 @@ def collect_projects_for_org(org_name):
     """Get all projects for an organization"""
     print(f"  Collecting projects for {org_name}...", file=sys.stderr)
     
-    cmd = ["gh", "project", "list", "--owner", org_name, "--format", "json", "--limit", "1000"]
+    cmd = ["gh", "project", "list", "--owner", org_name, "--format", "json"]
     
-    data = run_gh_command(cmd)
-    if data is None:
+    projects, total = run_gh_list(cmd, 'projects')
+    if projects is None:
         return []
     
-    projects = data.get('projects', [])
     print(f"    Found {len(projects)} projects", file=sys.stderr)
+    if len(projects) < total:
+        print(f"    Warning: GitHub reports {total} projects, only {len(projects)} were listed", file=sys.stderr)
     return projects
 
 
-def collect_project_items(project_number, org_name):
-    """Get all items from a project with full metadata"""
-    print(f"    Collecting items for project {project_number}...", file=sys.stderr)
-    
-    cmd = ["gh", "project", "item-list", str(project_number), "--owner", org_name, "--format", "json", "--limit", "1000"]
-    
-    data = run_gh_command(cmd)
-    if data is None:
-        return []
-    
-    items = data.get('items', [])
-    print(f"      Found {len(items)} items", file=sys.stderr)
-    return items
+def collect_project_items(project_number, org_name, expected=None):
+    """Get all items from a project with full metadata.
+
+    expected is the project's items.totalCount from the project list; returns
+    (items, complete), where complete says whether every item was collected.
+    """
+    cmd = ["gh", "project", "item-list", str(project_number), "--owner", org_name, "--format", "json"]
+    
+    items, total = run_gh_list(cmd, 'items', expected)
+    if items is None:
+        return [], False
+    
+    complete = len(items) >= total
+    print(f"    Project {project_number}: found {len(items)} of {total} items"
+          f"{'' if complete else ' (INCOMPLETE)'}", file=sys.stderr)
+    return items, complete
 
 
 def collect_all_data():
@@ -136,17 +168,24 @@ def collect_all_data():
     print(f"\nCollecting projects for {ORG_NAME}...", file=sys.stderr)
     projects = collect_projects_for_org(ORG_NAME)
     
-    # Collect project items for each project
+    # Collect project items for each project, several projects at a time
+    print(f"  Collecting items for {len(projects)} projects...", file=sys.stderr)
+    with ThreadPoolExecutor(max_workers=MAX_PARALLEL_PROJECTS) as executor:
+        results = list(executor.map(
+            lambda project: collect_project_items(
+                project.get('number'), ORG_NAME, project.get('items', {}).get('totalCount')
+            ),
+            projects
+        ))
+    
     project_items = {}
-    for project in projects:
-        project_number = project.get('number')
-        project_title = project.get('title', 'Unknown')
-        print(f"  Processing project {project_number}: {project_title}", file=sys.stderr)
-        
-        items = collect_project_items(project_number, ORG_NAME)
+    incomplete_projects = []
+    for project, (items, complete) in zip(projects, results):
+        if not complete:
+            incomplete_projects.append(project.get('number'))
         if items:
-            project_items[str(project_number)] = {
-                'title': project_title,
+            project_items[str(project.get('number'))] = {
+                'title': project.get('title', 'Unknown'),
                 'items': items
             }
     
@@ -167,13 +206,17 @@ def collect_all_data():
         'total_repositories': len(all_issues),
         'total_issues': sum(len(issues) for issues in all_issues.values()),
         'total_projects': len(projects),
-        'total_project_items': sum(len(data['items']) for data in project_items.values())
+        'total_project_items': sum(len(data['items']) for data in project_items.values()),
+        'incomplete_projects': incomplete_projects
     }
     
     summary_file = DATA_DIR / "summary.json"
     with open(summary_file, 'w') as f:
         json.dump(summary, f, indent=2)
     
+    if incomplete_projects:
+        print(f"\nWarning: items of projects {incomplete_projects} are incomplete; "
+              f"reports based on them may undercount", file=sys.stderr)
     print(f"\nData collection complete!", file=sys.stderr)
     print(f"Summary: {json.dumps(summary, indent=2)}", file=sys.stderr)
     
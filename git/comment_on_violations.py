@@ -30,11 +30,24 @@ Usage:
   python3 comment_on_violations_csv.py --filter-repo colonialism --filter-issue 24
   ```
 
+- **Digest per Assignee**
+  Instead of one comment per issue, write one digest per assignee listing all of
+  their flagged issues to output/digests/:
+  ```bash
+  python3 comment_on_violations_csv.py --digest
+  ```
+  Or post each digest as a single comment on one issue (e.g. a lab discussion issue),
+  so each person gets one notification:
+  ```bash
+  python3 comment_on_violations_csv.py --digest --digest-repo discussions --digest-issue 12 --execute
+  ```
+
 Requirements:
 - GitHub CLI (gh) must be installed and authenticated.
 """
 
 import csv
+import re
 import argparse
 from pathlib import Path
 from typing import Dict, List, Tuple, Set
@@ -169,6 +182,80 @@ _This is an automated message generated by the GitHub Police Report._
             except Exception as e:
                 print(f"❌ Error commenting on {repo}#{issue_num}: {str(e)}")
     
+    def build_digests(self) -> Dict[str, List[Tuple[str, int, Dict[str, any]]]]:
+        """Group violations by assignee in one pass; unassigned issues go under an empty name."""
+        digests = {}
+        for (repo, issue_num), violation_data in sorted(self.violations.items(), key=lambda x: (x[0][0], x[0][1])):
+            for assignee in sorted(violation_data['assignees']) or [""]:
+                digests.setdefault(assignee, []).append((repo, issue_num, violation_data))
+        return digests
+    
+    def format_digest(self, assignee: str, items: List[Tuple[str, int, Dict[str, any]]]) -> str:
+        """Format one digest comment covering all of an assignee's flagged issues."""
+        comment = f"@{assignee} - " if assignee else ""
+        comment += f"""🚨 **GitHub Police Report Violation Digest** 🚨
+
+{len(items)} issue(s) {'assigned to you ' if assignee else 'without an assignee '}have been flagged:
+
+"""
+        
+        for repo, issue_num, violation_data in items:
+            comment += f"- **{repo}#{issue_num}** [{violation_data['title']}]({violation_data['url']})\n"
+            for violation in sorted(violation_data['reasons']):
+                comment += f"  - {violation}\n"
+        
+        comment += """
+---
+
+**Action Required:** Please address these violations by:
+1. Updating the issues with the missing information
+2. Providing status updates on inactive issues
+3. Adjusting target dates on overdue issues
+
+_This is an automated message generated by the GitHub Police Report._
+"""
+        
+        return comment
+    
+    def write_digest(self, digest_dir: Path, assignee: str, digest: str):
+        """Save a digest as a markdown file named after the assignee."""
+        digest_dir.mkdir(parents=True, exist_ok=True)
+        name = re.sub(r'[^A-Za-z0-9_.-]', '_', assignee) or "unassigned"
+        path = digest_dir / f"{name}.md"
+        path.write_text(digest, encoding='utf-8')
+        print(f"📝 Wrote digest for {assignee or 'unassigned issues'} to {path}")
+    
+    def run_digests(self, digest_repo: str = None, digest_issue: int = None,
+                    digest_dir: Path = Path("output") / "digests", load_data=True):
+        """Produce one digest per assignee, posted to one issue or written to files."""
+        if load_data:
+            print("Loading violations from CSV files...")
+            self.load_all_violations()
+        
+        if not self.violations:
+            print("No violations found in the CSV files.")
+            return
+        
+        digests = self.build_digests()
+        print(f"\nFound violations for {len(self.violations)} issues across {len(digests)} assignee(s).")
+        
+        for assignee, items in sorted(digests.items()):
+            digest = self.format_digest(assignee, items)
+            if digest_repo and digest_issue:
+                self.comment_on_issue(digest_repo, digest_issue, digest)
+            else:
+                self.write_digest(digest_dir, assignee, digest)
+        
+        if digest_repo and digest_issue:
+            if self.dry_run:
+                print(f"\n🔍 DRY RUN COMPLETE - {len(digests)} digests would be posted to {digest_repo}#{digest_issue} "
+                      f"instead of {len(self.violations)} issue comments.")
+                print("Run with --execute to actually post comments.")
+            else:
+                print(f"\n✅ COMPLETE - Posted {len(digests)} digests to {digest_repo}#{digest_issue}.")
+        else:
+            print(f"\n✅ COMPLETE - Wrote {len(digests)} digests to {digest_dir}.")
+    
     def run(self, load_data=True):
         """Main execution method."""
         if load_data:
@@ -211,9 +298,32 @@ def main():
         type=int,
         help="Only comment on a specific issue number"
     )
+    parser.add_argument(
+        "--digest",
+        action="store_true",
+        help="Produce one digest per assignee instead of one comment per issue"
+    )
+    parser.add_argument(
+        "--digest-repo",
+        help="Repository of the issue to post digests on (with --digest-issue)"
+    )
+    parser.add_argument(
+        "--digest-issue",
+        type=int,
+        help="Issue number to post digests on; without it digests are written to --digest-dir"
+    )
+    parser.add_argument(
+        "--digest-dir",
+        type=Path,
+        default=Path("output") / "digests",
+        help="Directory to write digests to (default: output/digests)"
+    )
     
     args = parser.parse_args()
     
+    if bool(args.digest_repo) != bool(args.digest_issue):
+        parser.error("--digest-repo and --digest-issue must be given together")
+    
     # Check if gh CLI is available
     try:
         subprocess.run(["gh", "--version"], capture_output=True, check=True)
@@ -245,9 +355,14 @@ def main():
             filtered_violations[(repo, issue_num)] = violations
         
         commenter.violations = filtered_violations
-        commenter.run(load_data=False)  # Don't reload data since we already filtered
+        load_data = False  # Don't reload data since we already filtered
+    else:
+        load_data = True  # Load data normally
+    
+    if args.digest:
+        commenter.run_digests(args.digest_repo, args.digest_issue, args.digest_dir, load_data=load_data)
     else:
-        commenter.run()  # Load data normally
+        commenter.run(load_data=load_data)
 
 
 if __name__ == "__main__":
@@ -1,7 +1,18 @@
 #!/bin/bash
 
 # Script to pull all changes from all branches in all GitHub repositories
-# Usage: ./pull_all_repos.sh
+# Usage: ./pull_all_repos.sh [-j jobs] [-f]
+#
+# Repositories are updated in parallel, at most 8 at a time (-j or PULL_JOBS),
+# and each repository's output is printed once all of them are done.
+#
+# After a repository is fully updated its remote refs, branch heads, stale
+# branches and dirty state are saved as a snapshot (in ~/.cache/pull_all_repos,
+# or PULL_SNAPSHOT_DIR). On the next run, a repository whose 'git ls-remote'
+# output, branch heads and dirty state still match its snapshot is not
+# fetched; its result is reported from the snapshot. Repositories with a
+# failed fetch or branches needing manual intervention get no snapshot, so
+# they are retried every run. Use -f to fetch every repository anyway.
 
 # Colors for output
 RED='\033[0;31m'
@@ -13,6 +24,20 @@ NC='\033[0m' # No Color
 # Default directory for GitHub repos
 GITHUB_DIR="${GITHUB_DIR:-$HOME/Documents/GitHub}"
 
+# Number of repositories updated at once
+MAX_JOBS="${PULL_JOBS:-8}"
+
+# Skip repositories whose remote refs match their snapshot
+USE_SNAPSHOT=true
+
+while getopts "j:f" opt; do
+    case $opt in
+        j) MAX_JOBS=$OPTARG ;;
+        f) USE_SNAPSHOT=false ;;
+        *) echo "Usage: $0 [-j jobs] [-f]"; exit 1 ;;
+    esac
+done
+
 # Check if the GitHub directory exists
 if [ ! -d "$GITHUB_DIR" ]; then
     echo -e "${RED}Error: GitHub directory not found at $GITHUB_DIR${NC}"
@@ -22,112 +47,231 @@ fi
 
 # Change to GitHub directory
 cd "$GITHUB_DIR" || exit 1
+GITHUB_DIR=$(pwd)
+
+# Snapshots are kept per GitHub directory, one subdirectory per repository
+SNAPSHOT_DIR="${PULL_SNAPSHOT_DIR:-${XDG_CACHE_HOME:-$HOME/.cache}/pull_all_repos}/$(echo "$GITHUB_DIR" | tr '/' '_')"
+mkdir -p "$SNAPSHOT_DIR"
 
 echo -e "${BLUE}=== Pulling all changes from GitHub repositories ===${NC}"
 echo -e "Working directory: $GITHUB_DIR\n"
 
+# Parallel fetches cannot share the terminal for credential prompts
+export GIT_TERMINAL_PROMPT=0
+
+# Per-repository output and results
+RESULTS_DIR=$(mktemp -d)
+trap 'rm -rf "$RESULTS_DIR"' EXIT
+
+# Branch and tag refs of every remote, as 'git ls-remote' reports them;
+# fails if any remote cannot be reached
+list_remote_refs() {
+    local remote refs
+    for remote in $(git remote); do
+        refs=$(git ls-remote --heads --tags "$remote" 2>/dev/null) || return 1
+        echo "$refs" | sed "s|^|$remote |"
+    done
+}
+
+# Current branch, and each local branch with its head and upstream
+list_local_heads() {
+    git symbolic-ref -q HEAD
+    git for-each-ref --format='%(objectname) %(refname:short) %(upstream:short)' refs/heads
+}
+
+# Whether the working tree has uncommitted changes to tracked files
+working_tree_state() {
+    if git diff-index --quiet HEAD -- 2>/dev/null; then
+        echo "dirty=false"
+    else
+        echo "dirty=true"
+    fi
+}
+
+# Update one repository, printing its progress and writing its statistics
+# to $RESULTS_DIR/<repo>.result
+update_repo() {
+    local repo=$1
+    local snapshot="$SNAPSHOT_DIR/$repo"
+    local failed_pulls=0
+    local repo_had_changes=false
+    local stale_branches=()
+    local remote_refs
+
+    echo -e "${GREEN}Processing repository: $repo${NC}"
+    cd "$repo" || return 1
+
+    # Remote refs before fetching; empty if a remote cannot be reached
+    remote_refs=$(list_remote_refs) || remote_refs=""
+
+    # Nothing to do if neither the remotes, the local branches nor the working
+    # tree have changed since the last run (snapshots are only kept for runs
+    # where every branch was updated)
+    if [ "$USE_SNAPSHOT" = true ] && [ -n "$remote_refs" ] && [ -f "$snapshot/state" ] \
+        && [ "$remote_refs" = "$(cat "$snapshot/remote_refs")" ] \
+        && [ "$(list_local_heads)" = "$(cat "$snapshot/local_heads")" ] \
+        && grep -qxF "$(working_tree_state)" "$snapshot/state"; then
+        echo "  Remote refs unchanged since last run, skipping fetch"
+        stale_branches=($(sed -n 's/^stale_branches=//p' "$snapshot/state"))
+        report_stale_branches
+        write_result
+        return
+    fi
+    # Fetch all remotes and prune deleted branches (this also prunes stale
+    # remote-tracking references, so no separate 'git remote prune' is needed)
+    echo "  Fetching all remotes and pruning deleted branches..."
+    if ! git fetch --all --prune; then
+        echo -e "  ${RED}✗ Fetch failed, branches are compared with the last fetched state${NC}"
+        ((failed_pulls++))
+        # Without a completed fetch there is no snapshot to trust; fetch again next run
+        remote_refs=""
+    fi
+
+    # Get current branch
+    current_branch=$(git branch --show-current)
+    echo "  Current branch: $current_branch"
+
+    # Branches checked out in other worktrees must be updated there
+    other_worktree_branches=$(git worktree list --porcelain | sed -n 's|^branch refs/heads/||p' | grep -vxF "$current_branch")
+
+    # Get list of all local branches
+    branches=$(git branch --format='%(refname:short)')
+
+    # Fast-forward each branch. Only the current branch touches the working
+    # tree; the others are advanced by updating their refs directly.
+    for branch in $branches; do
+        echo -e "  ${YELLOW}Checking branch: $branch${NC}"
+
+        # Get the remote tracking branch
+        remote_branch=$(git rev-parse --abbrev-ref --symbolic-full-name "$branch@{u}" 2>/dev/null)
+
+        if [ -z "$remote_branch" ]; then
+            echo "    No remote tracking branch (local only)"
+            continue
+        fi
+
+        # Check if the remote branch still exists
+        if ! git show-ref --verify --quiet "refs/remotes/$remote_branch"; then
+            echo -e "    ${RED}Remote branch no longer exists (stale)${NC}"
+            if [ "$branch" != "$current_branch" ]; then
+                stale_branches+=("$branch")
+            fi
+            continue
+        fi
+
+        # Check if there are updates
+        LOCAL=$(git rev-parse "refs/heads/$branch")
+        REMOTE=$(git rev-parse "refs/remotes/$remote_branch")
+
+        if [ "$LOCAL" = "$REMOTE" ]; then
+            echo "    Already up to date"
+        elif git merge-base --is-ancestor "$LOCAL" "$REMOTE"; then
+            if [ "$branch" = "$current_branch" ]; then
+                echo "    Fast-forwarding checked out branch..."
+                git merge --ff-only --quiet "$REMOTE"
+            elif echo "$other_worktree_branches" | grep -qxF "$branch"; then
+                echo -e "    ${YELLOW}Checked out in another worktree, update it there${NC}"
+                continue
+            else
+                echo "    Fast-forwarding ref..."
+                # Only moves the ref if it still points at LOCAL
+                git update-ref -m "pull_all_repos: fast-forward to $remote_branch" "refs/heads/$branch" "$REMOTE" "$LOCAL"
+            fi
+
+            if [ $? -eq 0 ]; then
+                echo -e "    ${GREEN}✓ Successfully pulled changes${NC}"
+                repo_had_changes=true
+            else
+                echo -e "    ${RED}✗ Failed to pull (might need merge)${NC}"
+                ((failed_pulls++))
+            fi
+        elif git merge-base --is-ancestor "$REMOTE" "$LOCAL"; then
+            echo -e "    ${YELLOW}Local branch is ahead of remote${NC}"
+        else
+            echo -e "    ${RED}Branches have diverged, manual merge required${NC}"
+            ((failed_pulls++))
+        fi
+    done
+
+    report_stale_branches
+    write_result
+}
+
+# Handle stale branches (uses update_repo's variables)
+report_stale_branches() {
+    if [ ${#stale_branches[@]} -gt 0 ]; then
+        echo -e "  ${YELLOW}Found ${#stale_branches[@]} stale branch(es) with deleted remotes${NC}"
+        for stale_branch in "${stale_branches[@]}"; do
+            echo -e "    ${RED}Stale: $stale_branch${NC}"
+        done
+    fi
+}
+
+# Write the repository's result and refresh its snapshot (uses update_repo's
+# variables). Without remote refs to compare against, or with branches left
+# to fix, any old snapshot is dropped so the next run fetches and retries.
+write_result() {
+    {
+        echo "failed_pulls=$failed_pulls"
+        echo "repo_had_changes=$repo_had_changes"
+    } > "$RESULTS_DIR/$repo.result"
+
+    rm -rf "$snapshot"
+    if [ -n "$remote_refs" ] && [ "$failed_pulls" -eq 0 ]; then
+        mkdir -p "$snapshot"
+        echo "$remote_refs" > "$snapshot/remote_refs"
+        list_local_heads > "$snapshot/local_heads"
+        {
+            echo "stale_branches=${stale_branches[*]}"
+            working_tree_state
+            echo "updated_at=$(date '+%Y-%m-%d %H:%M:%S')"
+        } > "$snapshot/state"
+    fi
+}
+
+# Collect repositories
+repos=()
+for repo in */; do
+    if [ -d "$repo/.git" ]; then
+        repos+=("${repo%/}")
+    else
+        echo -e "${YELLOW}Skipping ${repo%/}: Not a git repository${NC}\n"
+    fi
+done
+
+echo -e "Updating ${#repos[@]} repositories, $MAX_JOBS at a time...\n"
+
+# Update repositories in parallel, keeping at most MAX_JOBS running
+for repo in "${repos[@]}"; do
+    while [ "$(jobs -rp | wc -l)" -ge "$MAX_JOBS" ]; do
+        sleep 0.2
+    done
+    update_repo "$repo" > "$RESULTS_DIR/$repo.log" 2>&1 &
+done
+wait
+
 # Track statistics
 total_repos=0
 successful_pulls=0
 failed_pulls=0
 repos_with_changes=0
 
-# Process each directory
-for repo in */; do
-    if [ -d "$repo/.git" ]; then
-        ((total_repos++))
-        echo -e "${GREEN}Processing repository: ${repo%/}${NC}"
-        cd "$repo" || continue
-        
-        # Fetch all remotes and prune deleted branches
-        echo "  Fetching all remotes and pruning deleted branches..."
-        git fetch --all --prune
-        
-        # Get current branch
-        current_branch=$(git branch --show-current)
-        echo "  Current branch: $current_branch"
-        
-        # Clean up stale remote-tracking references
-        git remote prune origin 2>/dev/null
-        
-        # Get list of all local branches
-        branches=$(git branch --format='%(refname:short)')
-        
-        # Track if any branch had changes
-        repo_had_changes=false
-        stale_branches=()
-        
-        # Pull changes for each branch
-        for branch in $branches; do
-            echo -e "  ${YELLOW}Checking branch: $branch${NC}"
-            
-            # Switch to the branch
-            git checkout "$branch" --quiet 2>/dev/null
-            
-            if [ $? -eq 0 ]; then
-                # Get the remote tracking branch
-                remote_branch=$(git rev-parse --abbrev-ref --symbolic-full-name "@{u}" 2>/dev/null)
-                
-                if [ -n "$remote_branch" ]; then
-                    # Check if the remote branch still exists
-                    if git show-ref --verify --quiet "refs/remotes/$remote_branch"; then
-                        # Check if there are updates
-                        LOCAL=$(git rev-parse @)
-                        REMOTE=$(git rev-parse "@{u}" 2>/dev/null)
-                        BASE=$(git merge-base @ "@{u}" 2>/dev/null)
-                        
-                        if [ "$LOCAL" = "$REMOTE" ]; then
-                            echo "    Already up to date"
-                        elif [ "$LOCAL" = "$BASE" ]; then
-                            echo "    Pulling changes..."
-                            if git pull --ff-only; then
-                                echo -e "    ${GREEN}✓ Successfully pulled changes${NC}"
-                                repo_had_changes=true
-                            else
-                                echo -e "    ${RED}✗ Failed to pull (might need merge)${NC}"
-                                ((failed_pulls++))
-                            fi
-                        elif [ "$REMOTE" = "$BASE" ]; then
-                            echo -e "    ${YELLOW}Local branch is ahead of remote${NC}"
-                        else
-                            echo -e "    ${RED}Branches have diverged, manual merge required${NC}"
-                            ((failed_pulls++))
-                        fi
-                    else
-                        echo -e "    ${RED}Remote branch no longer exists (stale)${NC}"
-                        if [ "$branch" != "$current_branch" ]; then
-                            stale_branches+=("$branch")
-                        fi
-                    fi
-                else
-                    echo "    No remote tracking branch (local only)"
-                fi
-            else
-                echo -e "    ${RED}Failed to checkout branch${NC}"
-            fi
-        done
-        
-        # Handle stale branches
-        if [ ${#stale_branches[@]} -gt 0 ]; then
-            echo -e "  ${YELLOW}Found ${#stale_branches[@]} stale branch(es) with deleted remotes${NC}"
-            for stale_branch in "${stale_branches[@]}"; do
-                echo -e "    ${RED}Stale: $stale_branch${NC}"
-            done
-        fi
-        
-        # Return to original branch
-        git checkout "$current_branch" --quiet 2>/dev/null
-        
-        if [ "$repo_had_changes" = true ]; then
+# Print each repository's output and add up its results
+for repo in "${repos[@]}"; do
+    ((total_repos++))
+    cat "$RESULTS_DIR/$repo.log"
+
+    if [ -f "$RESULTS_DIR/$repo.result" ]; then
+        repo_failed_pulls=$(sed -n 's/^failed_pulls=//p' "$RESULTS_DIR/$repo.result")
+        ((failed_pulls += repo_failed_pulls))
+        if grep -q "^repo_had_changes=true" "$RESULTS_DIR/$repo.result"; then
             ((repos_with_changes++))
         fi
-        
         ((successful_pulls++))
-        cd ..
-        echo ""
     else
-        echo -e "${YELLOW}Skipping ${repo%/}: Not a git repository${NC}\n"
+        echo -e "  ${RED}✗ Update did not complete${NC}"
     fi
+    echo ""
 done
 
 # Summary
@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+"""
+Track a user's recent GitHub activity from the cached issue data.
+
+Activity is read from the snapshot saved by collect_github_data.py: comments a
+user wrote, issues assigned to them that were touched (updated by anyone), and
+their current assignments. The snapshot has no per-user timeline, so a touched
+issue is not necessarily one the assignee worked on.
+The snapshot is indexed by user and by day once, and the index is saved next
+to it (data/activity_index.json) so later reports are answered from the index.
+
+The snapshot only holds open issues as of its collection time. Unless --offline
+is given, issues involving the user that were updated after that are fetched
+from the GitHub API, which also picks up issues closed since.
+
+Usage:
+    python3 track_github_activity.py spkim1228 --days 2
+    python3 track_github_activity.py spkim1228 --days 7 --verbose
+    python3 track_github_activity.py --all --days 7      # Everyone in the snapshot
+"""
+import json
+import sys
+import argparse
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+
+from collect_github_data import DATA_DIR, ORG_NAME, run_gh_command
+
+INDEX_FILE = DATA_DIR / "activity_index.json"
+INDEX_VERSION = 1
+
+
+def parse_time(timestamp):
+    return datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
+
+
+def load_snapshot():
+    """Load the cached issues data"""
+    issues_file = DATA_DIR / "issues.json"
+    if not issues_file.exists():
+        print(f"Error: Cached data not found at {issues_file}", file=sys.stderr)
+        print("Please run collect_github_data.py first", file=sys.stderr)
+        sys.exit(1)
+
+    with open(issues_file, 'r') as f:
+        return json.load(f)
+
+
+def issue_events(repo, issue):
+    """Issue summary and its activity events: comments by their authors, and the
+    issue's last update (by anyone) as a touched assigned issue for each assignee"""
+    assignees = [a['login'] for a in issue.get('assignees', [])]
+    summary = {
+        'repo': repo,
+        'number': issue['number'],
+        'title': issue['title'],
+        'url': issue['url'],
+        'updated_at': issue['updatedAt'],
+        'assignees': assignees,
+    }
+    events = []
+    for comment in issue.get('comments', []):
+        author = (comment.get('author') or {}).get('login')
+        if author:
+            events.append({
+                'time': comment['createdAt'],
+                'user': author,
+                'type': 'comment',
+                'issue': issue['url'],
+                'url': comment.get('url', issue['url']),
+                'body': comment.get('body', ''),
+            })
+    for assignee in assignees:
+        events.append({
+            'time': issue['updatedAt'],
+            'user': assignee,
+            'type': 'assigned_update',
+            'issue': issue['url'],
+            'url': issue['url'],
+            'body': '',
+        })
+    return summary, events
+
+
+def build_index(issues_data):
+    """Index the snapshot's activity by user and by day"""
+    issues = {}
+    events = []
+    for repo, repo_issues in issues_data.get('repositories', {}).items():
+        for issue in repo_issues:
+            summary, issue_activity = issue_events(repo, issue)
+            issues[issue['url']] = summary
+            events.extend(issue_activity)
+    return index_events(issues_data.get('collection_time'), issues, events)
+
+
+def index_events(collection_time, issues, events):
+    events = sorted(events, key=lambda event: event['time'])
+    by_user = defaultdict(list)
+    by_day = defaultdict(list)
+    assigned = defaultdict(list)
+    for position, event in enumerate(events):
+        by_user[event['user'].lower()].append(position)
+        by_day[event['time'][:10]].append(position)
+    for url, issue in issues.items():
+        for assignee in issue['assignees']:
+            assigned[assignee.lower()].append(url)
+    return {
+        'version': INDEX_VERSION,
+        'collection_time': collection_time,
+        'issues': issues,
+        'events': events,
+        'by_user': dict(by_user),
+        'by_day': dict(by_day),
+        'assigned': dict(assigned),
+    }
+
+
+def load_index():
+    """The activity index for the current snapshot, rebuilding it if the snapshot changed"""
+    summary_file = DATA_DIR / "summary.json"
+    if INDEX_FILE.exists() and summary_file.exists():
+        # summary.json is small and written with every collection
+        with open(summary_file, 'r') as f:
+            collection_time = json.load(f).get('collection_time')
+        with open(INDEX_FILE, 'r') as f:
+            index = json.load(f)
+        if index.get('version') == INDEX_VERSION and index.get('collection_time') == collection_time:
+            return index
+
+    print("Indexing cached GitHub data...", file=sys.stderr)
+    issues_data = load_snapshot()
+    index = build_index(issues_data)
+    with open(INDEX_FILE, 'w') as f:
+        json.dump(index, f)
+    return index
+
+
+def fetch_recent_activity(user, index, since):
+    """Issues involving user updated since the start of the window that the snapshot lacks
+    or holds an older version of (updated after collection, or closed), from the API.
+
+    Returns ({url: issue summary}, [events]) for the fetched issues.
+    """
+    print(f"Checking GitHub for {user}'s issues updated since {since:%Y-%m-%d}...", file=sys.stderr)
+
+    try:
+        found = run_gh_command([
+            "gh", "search", "issues",
+            "--owner", ORG_NAME,
+            "--involves", user,
+            "--updated", f">={since:%Y-%m-%d}",
+            "--json", "repository,number,updatedAt,url",
+            "--limit", "1000",
+        ])
+    except FileNotFoundError:
+        found = None
+    if found is None:
+        print("Warning: GitHub search failed; reporting from the snapshot only", file=sys.stderr)
+        return {}, []
+
+    issues = {}
+    events = []
+    for result in found:
+        cached = index['issues'].get(result['url'])
+        # Issues the snapshot already holds in their latest state need no fetch
+        if cached and cached['updated_at'] == result['updatedAt']:
+            continue
+        repo = result['repository']['nameWithOwner']
+        issue = run_gh_command([
+            "gh", "issue", "view", str(result['number']),
+            "--repo", repo,
+            "--json", "number,title,url,updatedAt,assignees,comments",
+        ])
+        if issue is None:
+            continue
+        summary, issue_activity = issue_events(repo, issue)
+        issues[issue['url']] = summary
+        events.extend(issue_activity)
+    print(f"  Fetched {len(issues)} issue(s) not current in the snapshot", file=sys.stderr)
+    return issues, events
+
+
+def merge_fetched(index, issues, events):
+    """Index with fetched issues replacing their snapshot versions"""
+    if not issues:
+        return index
+    merged_issues = dict(index['issues'])
+    merged_issues.update(issues)
+    merged_events = [event for event in index['events'] if event['issue'] not in issues] + events
+    return index_events(index['collection_time'], merged_issues, merged_events)
+
+
+def user_events(index, user, since):
+    """The user's events at or after since, oldest first"""
+    return [index['events'][position] for position in index['by_user'].get(user.lower(), [])
+            if parse_time(index['events'][position]['time']) >= since]
+
+
+def issue_label(index, url):
+    issue = index['issues'].get(url, {})
+    repo_short = issue.get('repo', '').split('/')[-1]
+    return f"{repo_short} [#{issue.get('number', '?')}]({url})", issue.get('title', '')
+
+
+def excerpt(text, length=120):
+    text = ' '.join(text.split())
+    return text if len(text) <= length else text[:length - 1] + '…'
+
+
+def print_user_report(index, user, since, days, verbose):
+    events = user_events(index, user, since)
+    comments = [e for e in events if e['type'] == 'comment']
+    updated = {e['issue']: e for e in events if e['type'] == 'assigned_update'}
+    assigned = index['assigned'].get(user.lower(), [])
+
+    print(f"\n## GitHub activity for {user}: last {days} day(s)\n")
+    print(f"- Comments written: {len(comments)}")
+    print(f"- Assigned issues touched: {len(updated)}")
+    print(f"- Issues assigned: {len(assigned)}")
+
+    per_day = defaultdict(lambda: {'comment': 0, 'assigned_update': 0})
+    for event in events:
+        per_day[event['time'][:10]][event['type']] += 1
+    if per_day:
+        print("\n### By Day\n")
+        print("| Date | Comments | Assigned Issues Touched |")
+        print("|------|----------|-------------------------|")
+        for day in sorted(per_day):
+            print(f"| {day} | {per_day[day]['comment']} | {per_day[day]['assigned_update']} |")
+
+    if comments:
+        print("\n### Comments\n")
+        if verbose:
+            print("| Date | Issue | Title | Comment |")
+            print("|------|-------|-------|---------|")
+        else:
+            print("| Date | Issue | Title |")
+            print("|------|-------|-------|")
+        for event in comments:
+            label, title = issue_label(index, event['issue'])
+            row = f"| {event['time'][:16].replace('T', ' ')} | {label} | {title} |"
+            if verbose:
+                row += f" {excerpt(event['body']).replace('|', '/')} |"
+            print(row)
+
+    if updated:
+        print("\n### Assigned Issues Touched\n")
+        print("| Issue | Title | Last Updated |")
+        print("|-------|-------|--------------|")
+        for url, event in sorted(updated.items(), key=lambda item: item[1]['time'], reverse=True):
+            label, title = issue_label(index, url)
+            print(f"| {label} | {title} | {event['time'][:10]} |")
+
+    if verbose and assigned:
+        print("\n### Issues Assigned\n")
+        for url in assigned:
+            label, title = issue_label(index, url)
+            print(f"- {label} {title}")
+
+
+def print_lab_report(index, since, days):
+    """One row per user with activity in the window, read from the per-day index"""
+    totals = defaultdict(lambda: {'comment': 0, 'assigned_update': set()})
+    day = since.date()
+    while day <= datetime.now(timezone.utc).date():
+        for position in index['by_day'].get(day.isoformat(), []):
+            event = index['events'][position]
+            if parse_time(event['time']) < since:
+                continue
+            if event['type'] == 'comment':
+                totals[event['user']]['comment'] += 1
+            else:
+                totals[event['user']]['assigned_update'].add(event['issue'])
+        day += timedelta(days=1)
+
+    print(f"\n## GitHub activity: last {days} day(s)\n")
+    if not totals:
+        print("No activity found.")
+        return
+    print("| User | Comments | Assigned Issues Touched | Issues Assigned |")
+    print("|------|----------|-------------------------|-----------------|")
+    for user, counts in sorted(totals.items(), key=lambda item: item[1]['comment'], reverse=True):
+        print(f"| {user} | {counts['comment']} | {len(counts['assigned_update'])} | "
+              f"{len(index['assigned'].get(user.lower(), []))} |")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Track a user's recent GitHub activity")
+    parser.add_argument("user", nargs="?", help="GitHub username")
+    parser.add_argument("--days", type=int, default=2, help="Number of days to look back (default: 2)")
+    parser.add_argument("--all", action="store_true", help="Summarize every user in the snapshot")
+    parser.add_argument("--offline", action="store_true",
+                        help="Only use the snapshot, without fetching newer activity from GitHub")
+    parser.add_argument("--verbose", action="store_true", help="Include comment excerpts and assigned issues")
+
+    args = parser.parse_args()
+    if not args.user and not args.all:
+        parser.error("a user is required unless --all is given")
+
+    index = load_index()
+    print(f"Using data collected at: {index['collection_time']}", file=sys.stderr)
+    since = datetime.now(timezone.utc) - timedelta(days=args.days)
+
+    if args.all:
+        print_lab_report(index, since, args.days)
+        return
+
+    if not args.offline:
+        issues, events = fetch_recent_activity(args.user, index, since)
+        index = merge_fetched(index, issues, events)
+    print_user_report(index, args.user, since, args.days, args.verbose)
+
+
+if __name__ == "__main__":
+    main()
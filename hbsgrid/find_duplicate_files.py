@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+"""
+Find duplicate files within and across HBS grid project spaces.
+
+All project spaces are walked in one parallel pass (see fs_walk.py). Files are
+grouped by size first; only files sharing a size are hashed, first by a partial
+hash of their first and last blocks and then, for the ones still matching, by a
+full content hash. Hashing runs on a thread pool and results are kept in a
+hash cache keyed on path, size and mtime, so repeat runs only hash new or
+changed files.
+
+For each set of identical files the oldest copy is treated as the original and
+the others as reclaimable; hard links to the same file are not counted twice.
+
+Usage:
+    python3 find_duplicate_files.py                      # All projects, files of 1 MB and up
+    python3 find_duplicate_files.py mmiller_peps mmiller_emrisk
+    python3 find_duplicate_files.py --min-size 100       # Only files of 100 MB and up
+    python3 find_duplicate_files.py --json dupes.json    # Also save every duplicate group
+"""
+import os
+import sys
+import json
+import hashlib
+import sqlite3
+import argparse
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from pathlib import Path
+
+from fs_walk import DEFAULT_WORKERS, list_directory, walk_tree
+from size_index import STATE_DIR
+from project_registry import load_projects
+from size_growth_report import human_readable
+
+DEFAULT_CACHE_PATH = STATE_DIR / "hash_cache.sqlite"
+DEFAULT_HASH_WORKERS = 16
+DEFAULT_MIN_SIZE_MB = 1
+
+# Bytes read from each end of a file for the partial hash
+PARTIAL_BLOCK = 64 * 1024
+READ_CHUNK = 4 * 1024 * 1024
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS hashes (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    partial_hash TEXT,
+    full_hash TEXT
+);
+"""
+
+
+class HashCache:
+    """SQLite cache of partial and full hashes, valid while a file's size and mtime are unchanged"""
+
+    def __init__(self, path=DEFAULT_CACHE_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(self.path)
+        self.connection.executescript(SCHEMA)
+
+    def lookup(self, files, kind):
+        """{path: hash} of cached hashes of the given kind for (path, size, mtime_ns) files"""
+        cached = {}
+        for path, size, mtime_ns in files:
+            row = self.connection.execute(
+                f"SELECT {kind}_hash FROM hashes WHERE path = ? AND size = ? AND mtime_ns = ?",
+                (path, size, mtime_ns)
+            ).fetchone()
+            if row and row[0]:
+                cached[path] = row[0]
+        return cached
+
+    def store(self, entries, kind):
+        """Save (path, size, mtime_ns, hash) entries, dropping stale hashes of the other kind"""
+        with self.connection:
+            for path, size, mtime_ns, digest in entries:
+                self.connection.execute(
+                    "DELETE FROM hashes WHERE path = ? AND (size != ? OR mtime_ns != ?)", (path, size, mtime_ns)
+                )
+                self.connection.execute(
+                    "INSERT OR IGNORE INTO hashes (path, size, mtime_ns) VALUES (?, ?, ?)", (path, size, mtime_ns)
+                )
+                self.connection.execute(
+                    f"UPDATE hashes SET {kind}_hash = ? WHERE path = ?", (digest, path)
+                )
+
+    def close(self):
+        self.connection.close()
+
+
+def partial_hash(path, size):
+    """Hash of the first and last PARTIAL_BLOCK bytes"""
+    digest = hashlib.blake2b(str(size).encode())
+    with open(path, "rb") as f:
+        digest.update(f.read(PARTIAL_BLOCK))
+        if size > 2 * PARTIAL_BLOCK:
+            f.seek(-PARTIAL_BLOCK, os.SEEK_END)
+            digest.update(f.read(PARTIAL_BLOCK))
+    return digest.hexdigest()
+
+
+def full_hash(path, size):
+    digest = hashlib.blake2b()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(READ_CHUNK), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def hash_files(files, kind, cache, workers):
+    """{path: hash} for (path, size, mtime_ns) files, hashing uncached ones on a thread pool.
+
+    Files that cannot be read are left out.
+    """
+    hashes = cache.lookup(files, kind)
+    todo = [f for f in files if f[0] not in hashes]
+    hasher = partial_hash if kind == "partial" else full_hash
+
+    def work(entry):
+        path, size, mtime_ns = entry
+        try:
+            return entry, hasher(path, size)
+        except OSError:
+            return entry, None
+
+    computed = []
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for (path, size, mtime_ns), digest in executor.map(work, todo):
+            if digest is not None:
+                hashes[path] = digest
+                computed.append((path, size, mtime_ns, digest))
+    cache.store(computed, kind)
+    return hashes
+
+
+def collect_files(projects, min_size, workers=DEFAULT_WORKERS):
+    """Walk all projects at once; returns ({path: (project, size, mtime_ns)}, unreadable dir count)"""
+    root_to_project = {str(path): name for name, path in projects.items()}
+    files = {}
+    unreadable = 0
+    lister = partial(list_directory, skip_symlinks=True)
+    for listing in walk_tree(list(root_to_project), workers=workers, lister=lister):
+        if listing.error is not None:
+            unreadable += 1
+            continue
+        project = root_to_project[listing.root]
+        for name, size, mtime_ns in listing.files:
+            if size >= min_size:
+                files[os.path.join(listing.path, name)] = (project, size, mtime_ns)
+    return files, unreadable
+
+
+def refine(groups, kind, cache, workers):
+    """Split each group of (path, size, mtime_ns) by hash, keeping sub-groups of two or more"""
+    candidates = [entry for group in groups for entry in group]
+    hashes = hash_files(candidates, kind, cache, workers)
+    refined = []
+    for group in groups:
+        by_hash = defaultdict(list)
+        for entry in group:
+            if entry[0] in hashes:
+                by_hash[hashes[entry[0]]].append(entry)
+        refined.extend(g for g in by_hash.values() if len(g) > 1)
+    return refined
+
+
+def find_duplicates(projects, min_size, cache, walk_workers=DEFAULT_WORKERS, hash_workers=DEFAULT_HASH_WORKERS):
+    """Duplicate groups across the given projects, largest reclaimable first.
+
+    Each group is {"size", "reclaimable", "files": [{"project", "path", "mtime_ns", "original", "hard_link"}]}.
+    """
+    files, unreadable = collect_files(projects, min_size, walk_workers)
+    print(f"📂 {len(files):,} files of {human_readable(min_size)} or more"
+          f"{f', {unreadable} unreadable directories skipped' if unreadable else ''}", flush=True)
+
+    by_size = defaultdict(list)
+    for path, (project, size, mtime_ns) in files.items():
+        by_size[size].append((path, size, mtime_ns))
+    groups = [group for group in by_size.values() if len(group) > 1]
+    print(f"📏 {sum(len(g) for g in groups):,} files share a size with another file", flush=True)
+
+    groups = refine(groups, "partial", cache, hash_workers)
+    print(f"🔎 {sum(len(g) for g in groups):,} files match on partial hash", flush=True)
+    groups = refine(groups, "full", cache, hash_workers)
+    print(f"🧬 {sum(len(g) for g in groups):,} files in {len(groups):,} groups match on full hash\n", flush=True)
+
+    duplicates = []
+    for group in groups:
+        # Oldest copy is the original; hard links share an inode and free nothing
+        entries = sorted(group, key=lambda entry: (entry[2], entry[0]))
+        inodes = set()
+        members = []
+        for path, size, mtime_ns in entries:
+            try:
+                stat = os.stat(path)
+                inode = (stat.st_dev, stat.st_ino)
+            except OSError:
+                inode = path
+            members.append({
+                "project": files[path][0],
+                "path": path,
+                "mtime_ns": mtime_ns,
+                "original": not members,
+                "hard_link": inode in inodes,
+            })
+            inodes.add(inode)
+        size = entries[0][1]
+        duplicates.append({"size": size, "reclaimable": size * (len(inodes) - 1), "files": members})
+    return sorted(duplicates, key=lambda d: d["reclaimable"], reverse=True)
+
+
+def reclaimable_by_project(duplicates):
+    """{project: {"reclaimable", "copies", "cross_project"}} for the non-original copies in each project"""
+    totals = defaultdict(lambda: {"reclaimable": 0, "copies": 0, "cross_project": 0})
+    for group in duplicates:
+        original_project = group["files"][0]["project"]
+        for member in group["files"][1:]:
+            if member["hard_link"]:
+                continue
+            total = totals[member["project"]]
+            total["reclaimable"] += group["size"]
+            total["copies"] += 1
+            if member["project"] != original_project:
+                total["cross_project"] += group["size"]
+    return dict(totals)
+
+
+def print_report(duplicates, top_n):
+    per_project = reclaimable_by_project(duplicates)
+    total = sum(group["reclaimable"] for group in duplicates)
+
+    print("## Duplicate Files Report\n")
+    if not duplicates:
+        print("No duplicate files found.")
+        return
+
+    print("| Project | Duplicate Copies | Reclaimable | Copies of Other Projects' Files |")
+    print("|---------|------------------|-------------|---------------------------------|")
+    for project, totals in sorted(per_project.items(), key=lambda item: item[1]["reclaimable"], reverse=True):
+        print(f"| {project} | {totals['copies']:,} | {human_readable(totals['reclaimable'])} | "
+              f"{human_readable(totals['cross_project'])} |")
+    print(f"\n**Total reclaimable:** {human_readable(total)} in {len(duplicates):,} duplicate groups\n")
+
+    print("### Largest Duplicate Groups\n")
+    for group in duplicates[:top_n]:
+        print(f"- {human_readable(group['size'])} × {len(group['files'])} copies, "
+              f"{human_readable(group['reclaimable'])} reclaimable")
+        for member in group["files"]:
+            note = " (original)" if member["original"] else " (hard link)" if member["hard_link"] else ""
+            print(f"  - `{member['path']}`{note}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Find duplicate files across HBS grid project spaces")
+    parser.add_argument("projects", nargs="*", help="Project names to search (default: all)")
+    parser.add_argument("--min-size", type=float, default=DEFAULT_MIN_SIZE_MB,
+                        help=f"Ignore files smaller than this many MB (default: {DEFAULT_MIN_SIZE_MB})")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS,
+                        help=f"Number of directory listing threads (default: {DEFAULT_WORKERS})")
+    parser.add_argument("--hash-workers", type=int, default=DEFAULT_HASH_WORKERS,
+                        help=f"Number of hashing threads (default: {DEFAULT_HASH_WORKERS})")
+    parser.add_argument("--top", type=int, default=20, help="Number of duplicate groups to list (default: 20)")
+    parser.add_argument("--cache", default=str(DEFAULT_CACHE_PATH),
+                        help=f"Hash cache database (default: {DEFAULT_CACHE_PATH})")
+    parser.add_argument("--json", help="Write all duplicate groups to this JSON file")
+
+    args = parser.parse_args()
+
+    registered = load_projects()
+    unknown = [name for name in args.projects if name not in registered]
+    if unknown:
+        print(f"Error: Unknown project(s): {', '.join(unknown)}", file=sys.stderr)
+        print(f"Available projects: {', '.join(registered)}", file=sys.stderr)
+        sys.exit(1)
+    projects = {name: registered[name] for name in (args.projects or registered)}
+
+    print(f"Searching {len(projects)} project spaces for duplicate files...")
+    cache = HashCache(args.cache)
+    try:
+        duplicates = find_duplicates(projects, max(int(args.min_size * 1024 ** 2), 1), cache,
+                                     walk_workers=args.workers, hash_workers=args.hash_workers)
+    finally:
+        cache.close()
+
+    print_report(duplicates, args.top)
+    if args.json:
+        Path(args.json).write_text(json.dumps({
+            "reclaimable_by_project": reclaimable_by_project(duplicates),
+            "groups": duplicates,
+        }, indent=2))
+        print(f"\nFull results saved to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
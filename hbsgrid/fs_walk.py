@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Parallel directory walker shared by the hbsgrid size, sync and duplicate tools.
+
+Directories are listed with os.scandir on a pool of threads fed from a work
+queue, which keeps many metadata requests in flight at once on NFS instead of
+walking one directory at a time like du or find.
+"""
+import os
+import queue
+import threading
+from collections import namedtuple
+
+DEFAULT_WORKERS = 32
+
+# files is a list of (name, size_bytes, mtime_ns); subdirs is a list of names.
+# summary is optional lister-provided data (e.g. cached totals standing in for files).
+# error is set (and files/subdirs are empty) when the directory could not be read.
+DirectoryListing = namedtuple(
+    "DirectoryListing", "root path mtime_ns files subdirs summary error", defaults=(None, None)
+)
+
+
+def list_directory(path, skip_symlinks=False):
+    """List one directory, returning (mtime_ns, files, subdirs) without following symlinks.
+
+    Symlinks are reported as files unless skip_symlinks is set.
+    """
+    # Read before listing: a change made during the listing then leaves the
+    # returned mtime stale, so a cached listing is redone on the next walk
+    mtime_ns = os.stat(path).st_mtime_ns
+    files = []
+    subdirs = []
+    with os.scandir(path) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                subdirs.append(entry.name)
+            elif skip_symlinks and entry.is_symlink():
+                continue
+            else:
+                stat = entry.stat(follow_symlinks=False)
+                files.append((entry.name, stat.st_size, stat.st_mtime_ns))
+    return mtime_ns, files, subdirs
+
+
+def walk_tree(roots, workers=DEFAULT_WORKERS, lister=list_directory):
+    """Yield a DirectoryListing for every directory under each root, in no particular order.
+
+    lister(path) must return (mtime_ns, files, subdirs) like list_directory; callers
+    can substitute one that answers from a cache, optionally returning a fourth
+    summary element that is passed through on the listing. Listings are produced by worker
+    threads but yielded on the calling thread, so consumers need no locking.
+    """
+    if isinstance(roots, (str, os.PathLike)):
+        roots = [roots]
+
+    pending = queue.Queue()
+    results = queue.Queue()
+
+    def worker():
+        while True:
+            item = pending.get()
+            if item is None:
+                return
+            root, path = item
+            try:
+                results.put(DirectoryListing(root, path, *lister(path)))
+            except Exception as e:
+                # Report rather than die, or the walk would wait forever on this path
+                results.put(DirectoryListing(root, path, None, [], [], error=e))
+
+    threads = [threading.Thread(target=worker, daemon=True) for _ in range(workers)]
+    for thread in threads:
+        thread.start()
+
+    # Only this thread schedules work, so a plain counter tracks completion
+    outstanding = 0
+    for root in roots:
+        pending.put((str(root), str(root)))
+        outstanding += 1
+
+    try:
+        while outstanding:
+            listing = results.get()
+            outstanding -= 1
+            for name in listing.subdirs:
+                pending.put((listing.root, os.path.join(listing.path, name)))
+                outstanding += 1
+            yield listing
+    finally:
+        # Also runs if the consumer stops early; queued paths are abandoned
+        while True:
+            try:
+                pending.get_nowait()
+            except queue.Empty:
+                break
+        for _ in threads:
+            pending.put(None)
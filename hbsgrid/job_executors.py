@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Job executors used by sync_orchestrator.py to run sync and scan jobs.
+
+All executors share one interface: submit(name, command, log_path) starts a
+job whose stdout and stderr both go to log_path and returns a job ID (or None
+if it could not be submitted), and wait(job_ids) blocks until the jobs finish
+and returns each one's final state, DONE or EXIT like LSF.
+
+- BsubExecutor submits each job to the LSF grid and polls bjobs.
+- LocalExecutor runs jobs as processes on this machine, at most max_parallel
+  at a time, for workstations and test containers without LSF.
+- DryRunExecutor only prints the commands it would run.
+"""
+import time
+import shlex
+import shutil
+import subprocess
+from concurrent.futures import ThreadPoolExecutor, wait as wait_futures
+from datetime import datetime
+
+DEFAULT_POLL_INTERVAL = 60
+DEFAULT_LOCAL_PARALLEL = 4
+
+BJOBS_TIMEOUT = 120
+
+# LSF job states after which a job will not run again
+FINISHED_STATES = {"DONE", "EXIT", "NOT_FOUND"}
+
+
+def print_progress(finished, total):
+    print(f"⏳ {datetime.now():%H:%M:%S} {finished}/{total} jobs finished", flush=True)
+
+
+class BsubExecutor:
+    """Runs jobs on the LSF grid with bsub"""
+
+    name = "bsub"
+    detached = True  # jobs keep running after the orchestrator exits
+
+    def __init__(self, poll_interval=DEFAULT_POLL_INTERVAL):
+        self.poll_interval = poll_interval
+
+    def submit(self, name, command, log_path):
+        # LSF runs the command through a shell, so it goes as one quoted string.
+        # Without -e, LSF writes stderr (where rclone logs) to the same file as stdout
+        result = subprocess.run(["bsub", "-J", name, "-o", str(log_path),
+                                 shlex.join(str(part) for part in command)],
+                                capture_output=True, text=True)
+        output = (result.stdout + result.stderr).strip()
+        # bsub prints "Job <12345> is submitted to queue <normal>."
+        if result.returncode != 0 or "Job <" not in output:
+            print(f"  ✗ Failed to submit job for {name}")
+            print(f"    Error: {output}")
+            return None
+        job_id = output.split("Job <", 1)[1].split(">", 1)[0]
+        print(f"  ✓ Job {job_id} submitted for {name}")
+        return job_id
+
+    def status(self, job_ids, previous=None):
+        """Current LSF state of each job; jobs LSF has already forgotten are NOT_FOUND.
+
+        Jobs bjobs says nothing about (say, when the call fails) keep their
+        state from previous, or are UNKNOWN, so they are asked about again.
+        """
+        states = {job_id: (previous or {}).get(job_id, "UNKNOWN") for job_id in job_ids}
+        try:
+            result = subprocess.run(["bjobs", "-noheader", "-o", "jobid stat"] + list(job_ids),
+                                    capture_output=True, text=True, timeout=BJOBS_TIMEOUT)
+        except (OSError, subprocess.TimeoutExpired) as e:
+            print(f"  ⚠️  bjobs failed, retrying next poll: {e}")
+            return states
+
+        # bjobs exits nonzero when any job is not found, so the output decides
+        reported = False
+        for line in result.stdout.splitlines():
+            fields = line.split()
+            if len(fields) == 2 and fields[0] in states:
+                states[fields[0]] = fields[1]
+                reported = True
+        # For forgotten jobs bjobs prints "Job <12345> is not found"
+        for line in (result.stdout + result.stderr).splitlines():
+            if line.startswith("Job <") and line.rstrip().endswith("is not found"):
+                job_id = line.split("Job <", 1)[1].split(">", 1)[0]
+                if job_id in states:
+                    states[job_id] = "NOT_FOUND"
+                    reported = True
+        if result.returncode != 0 and not reported:
+            print(f"  ⚠️  bjobs failed, retrying next poll: {(result.stdout + result.stderr).strip()}")
+        return states
+
+    def wait(self, job_ids):
+        """Poll bjobs until every job has finished; returns their final states"""
+        states = {}
+        while True:
+            states = self.status(job_ids, states)
+            running = [job_id for job_id, state in states.items() if state not in FINISHED_STATES]
+            if not running:
+                return states
+            print_progress(len(job_ids) - len(running), len(job_ids))
+            time.sleep(self.poll_interval)
+
+
+class LocalExecutor:
+    """Runs jobs as local processes, at most max_parallel at once"""
+
+    name = "local"
+    detached = False  # jobs are children of the orchestrator
+
+    def __init__(self, max_parallel=DEFAULT_LOCAL_PARALLEL, poll_interval=DEFAULT_POLL_INTERVAL):
+        self.pool = ThreadPoolExecutor(max_workers=max_parallel)
+        self.poll_interval = poll_interval
+        self.futures = {}
+
+    @staticmethod
+    def run(command, log_path):
+        with open(log_path, "w") as log:
+            return subprocess.run(list(command), stdout=log, stderr=subprocess.STDOUT).returncode
+
+    def submit(self, name, command, log_path):
+        job_id = f"local-{len(self.futures) + 1}"
+        self.futures[job_id] = self.pool.submit(self.run, command, log_path)
+        print(f"  ✓ Job {job_id} queued for {name}")
+        return job_id
+
+    def wait(self, job_ids):
+        futures = [self.futures[job_id] for job_id in job_ids]
+        while True:
+            done, pending = wait_futures(futures, timeout=self.poll_interval)
+            if not pending:
+                break
+            print_progress(len(done), len(futures))
+
+        states = {}
+        for job_id in job_ids:
+            future = self.futures[job_id]
+            states[job_id] = "DONE" if future.exception() is None and future.result() == 0 else "EXIT"
+        return states
+
+
+class DryRunExecutor:
+    """Prints the commands instead of running them"""
+
+    name = "dry-run"
+    detached = False
+
+    def __init__(self, **kwargs):
+        self.count = 0
+
+    def submit(self, name, command, log_path):
+        self.count += 1
+        print(f"  {name}: {' '.join(str(part) for part in command)} > {log_path}")
+        return f"dry-run-{self.count}"
+
+    def wait(self, job_ids):
+        return {job_id: "DONE" for job_id in job_ids}
+
+
+EXECUTORS = {
+    "bsub": BsubExecutor,
+    "local": LocalExecutor,
+    "dry-run": DryRunExecutor,
+}
+
+
+def make_executor(name="auto", max_parallel=DEFAULT_LOCAL_PARALLEL, poll_interval=DEFAULT_POLL_INTERVAL):
+    """Executor by name; 'auto' picks bsub when it is on PATH and local otherwise"""
+    if name == "auto":
+        name = "bsub" if shutil.which("bsub") else "local"
+    if name == "local":
+        return LocalExecutor(max_parallel=max_parallel, poll_interval=poll_interval)
+    return EXECUTORS[name](poll_interval=poll_interval)
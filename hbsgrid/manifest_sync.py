@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+Sync one project space to the remote, sending rclone only what changed.
+
+A full `rclone sync` lists and compares every file on both sides. Instead, this
+keeps a manifest of each file's size and mtime as of the last successful sync,
+walks the project space locally in parallel (see fs_walk.py), and compares the
+two. Only new or changed files are passed to `rclone copy --files-from-raw`, and
+files that disappeared are removed with `rclone delete --files-from-raw`, so
+rclone never has to list the remote.
+
+A full `rclone sync` still runs when there is no manifest for the destination,
+when the last full sync is older than --full-every days, or with --full. It
+catches anything the manifest cannot see, such as changes made on the remote
+side or empty directories.
+
+Large project spaces can be synced in parts (see sync_orchestrator.py): each
+--part is one top-level directory, or "." for the files directly in the project
+root, and keeps its own manifest so parts can move between jobs freely.
+
+Bandwidth limits and transfer/checker caps come from the sync policy (see
+sync_policy.py) unless given on the command line.
+
+Usage:
+    python3 manifest_sync.py mmiller_peps                     # Incremental sync to dropbox:hbsgrid/mmiller_peps
+    python3 manifest_sync.py mmiller_peps --full              # Force a full rclone sync
+    python3 manifest_sync.py mmiller_peps --dry-run           # Show what would be transferred
+    python3 manifest_sync.py mmiller_peps --source /path --remote dropbox:backup
+    python3 manifest_sync.py mmiller_peps --part data --part .  # Only data/ and the root files
+"""
+import os
+import sys
+import gzip
+import json
+import shlex
+import argparse
+import subprocess
+import tempfile
+from datetime import datetime, timezone
+from functools import partial
+
+from fs_walk import DEFAULT_WORKERS, list_directory, walk_tree
+from size_index import STATE_DIR
+from project_registry import load_projects
+from sync_policy import DEFAULT_POLICY_PATH, apply_policy, load_policy
+
+MANIFEST_DIR = STATE_DIR / "sync_manifests"
+DEFAULT_REMOTE = os.environ.get("HBSGRID_SYNC_REMOTE", "dropbox:hbsgrid")
+FULL_SYNC_INTERVAL_DAYS = 7
+
+# Part name for the files directly in a project root, without its subdirectories
+ROOT_FILES_PART = "."
+
+# Periodic stats blocks instead of --progress, which is unreadable in bsub logs;
+# sync_report.py parses the final block of each rclone run
+RCLONE_STATS_FLAGS = ["--stats", "1m", "--stats-log-level", "NOTICE"]
+
+
+def manifest_path(project, part=None):
+    if part is None:
+        return MANIFEST_DIR / f"{project}.json.gz"
+    return MANIFEST_DIR / project / ("_root_files.json.gz" if part == ROOT_FILES_PART else f"{part}.json.gz")
+
+
+def load_manifest(project, part=None):
+    path = manifest_path(project, part)
+    if not path.exists():
+        return None
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_manifest(project, manifest, part=None):
+    """Write the manifest atomically so an interrupted run keeps the previous one"""
+    path = manifest_path(project, part)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with gzip.open(temp_path, "wt", encoding="utf-8") as f:
+        json.dump(manifest, f)
+    os.replace(temp_path, path)
+
+
+def list_root_files(path):
+    """Lister for the root files part: the directory's own files, no subdirectories"""
+    mtime_ns, files, _ = list_directory(path, skip_symlinks=True)
+    return mtime_ns, files, []
+
+
+def build_manifest(source, workers=DEFAULT_WORKERS, recursive=True):
+    """Walk the source tree and return ({relpath: [size, mtime_ns]}, unreadable relative dirs).
+
+    Symlinks are left out, matching rclone's default of skipping them.
+    """
+    files = {}
+    unreadable = []
+    lister = partial(list_directory, skip_symlinks=True) if recursive else list_root_files
+    for listing in walk_tree(source, workers=workers, lister=lister):
+        relpath = os.path.relpath(listing.path, source)
+        if listing.error is not None:
+            unreadable.append(relpath)
+            continue
+        for name, size, mtime_ns in listing.files:
+            files[name if relpath == "." else os.path.join(relpath, name)] = [size, mtime_ns]
+    return files, unreadable
+
+
+def is_under(path, directories):
+    return any(d == "." or path == d or path.startswith(d + os.sep) for d in directories)
+
+
+def diff_manifests(old_files, new_files, unreadable=()):
+    """Return (changed, removed) relative paths between two manifests.
+
+    Files under unreadable directories are never reported as removed, since they
+    may well still exist.
+    """
+    changed = sorted(path for path, entry in new_files.items() if old_files.get(path) != entry)
+    removed = sorted(
+        path for path in old_files
+        if path not in new_files and not is_under(path, unreadable)
+    )
+    return changed, removed
+
+
+def run_rclone(args):
+    """Run rclone with the given arguments, streaming its output; returns the exit code"""
+    command = ["rclone"] + args + RCLONE_STATS_FLAGS
+    print(f"$ {shlex.join(command)}", flush=True)
+    return subprocess.run(command).returncode
+
+
+def run_with_file_list(args, paths):
+    """Run rclone with paths written to a --files-from-raw list"""
+    with tempfile.NamedTemporaryFile("w", encoding="utf-8", suffix=".txt", delete=False) as f:
+        f.write("\n".join(paths) + "\n")
+        list_path = f.name
+    try:
+        return run_rclone(args + ["--files-from-raw", list_path])
+    finally:
+        os.unlink(list_path)
+
+
+def sync_project(project, source, destination, part=None, full=False, full_every_days=FULL_SYNC_INTERVAL_DAYS,
+                 workers=DEFAULT_WORKERS, dry_run=False, rclone_args=()):
+    """Sync one project space, or one part of it; returns True on success"""
+    rclone_args = list(rclone_args)
+    recursive = part != ROOT_FILES_PART
+    if part is not None and recursive:
+        source = os.path.join(source, part)
+        destination = f"{destination}/{part}"
+    elif not recursive:
+        # Sync the root files only; subdirectories are other parts
+        rclone_args += ["--max-depth", "1"]
+    now = datetime.now(timezone.utc)
+    previous = load_manifest(project, part)
+
+    print(f"📂 Listing {source}{'' if recursive else ' (root files only)'}...", flush=True)
+    files, unreadable = build_manifest(source, workers=workers, recursive=recursive)
+    print(f"   - {len(files):,} files, {sum(size for size, _ in files.values()) / 1024 ** 3:.2f} GB")
+    if unreadable:
+        print(f"   ⚠️  {len(unreadable)} unreadable directories, their files are left alone on the remote")
+
+    reason = None
+    if full:
+        reason = "requested with --full"
+    elif previous is None:
+        reason = "no manifest from a previous sync"
+    elif previous["destination"] != destination:
+        reason = f"last synced to {previous['destination']}"
+    else:
+        last_full = datetime.fromisoformat(previous["full_sync_at"])
+        if (now - last_full).total_seconds() > full_every_days * 86400:
+            reason = f"last full sync was {last_full:%Y-%m-%d}"
+
+    if reason:
+        print(f"🔄 Full sync ({reason})")
+        if dry_run:
+            return True
+        if run_rclone(["sync", source, destination] + rclone_args) != 0:
+            return False
+        full_sync_at = now.isoformat()
+    else:
+        changed, removed = diff_manifests(previous["files"], files, unreadable)
+        changed_bytes = sum(files[path][0] for path in changed)
+        print(f"🔄 Incremental sync: {len(changed):,} new or changed files "
+              f"({changed_bytes / 1024 ** 3:.2f} GB), {len(removed):,} removed")
+        if dry_run:
+            for path in changed[:20]:
+                print(f"   + {path}")
+            for path in removed[:20]:
+                print(f"   - {path}")
+            return True
+        if changed and run_with_file_list(["copy", source, destination, "--no-traverse"] + rclone_args, changed) != 0:
+            return False
+        if removed and run_with_file_list(["delete", destination] + rclone_args, removed) != 0:
+            return False
+        full_sync_at = previous["full_sync_at"]
+
+    if unreadable and previous is not None:
+        # Keep what we knew about unreadable directories so they are not re-sent later
+        for path, entry in previous["files"].items():
+            if path not in files and is_under(path, unreadable):
+                files[path] = entry
+
+    save_manifest(project, {
+        "project": project,
+        "part": part,
+        "source": source,
+        "destination": destination,
+        "synced_at": now.isoformat(),
+        "full_sync_at": full_sync_at,
+        "files": files,
+    }, part)
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sync a project space to the remote using a local change manifest",
+                                     # Unknown options go to rclone; none may be read as an abbreviation
+                                     allow_abbrev=False)
+    parser.add_argument("project", help="Project name (see project_registry.py)")
+    parser.add_argument("--source", help="Project path (default: looked up in the project registry)")
+    parser.add_argument("--remote", default=DEFAULT_REMOTE,
+                        help=f"rclone remote path; the project is synced to REMOTE/PROJECT (default: {DEFAULT_REMOTE})")
+    parser.add_argument("--full", action="store_true", help="Run a full rclone sync")
+    parser.add_argument("--full-every", type=float, default=FULL_SYNC_INTERVAL_DAYS,
+                        help=f"Run a full sync when the last one is older than this many days "
+                             f"(default: {FULL_SYNC_INTERVAL_DAYS})")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS,
+                        help=f"Number of listing threads (default: {DEFAULT_WORKERS})")
+    parser.add_argument("--part", action="append",
+                        help=f"Sync only this top-level directory, or '{ROOT_FILES_PART}' for the root files "
+                             f"(repeatable; default: the whole project)")
+    parser.add_argument("--dry-run", action="store_true", help="Show what would be synced without running rclone")
+    parser.add_argument("--policy", default=str(DEFAULT_POLICY_PATH),
+                        help=f"Bandwidth and concurrency policy (default: {DEFAULT_POLICY_PATH})")
+    parser.add_argument("--bwlimit-share", type=int, default=1,
+                        help="Number of jobs syncing this project at once, which split its bandwidth (default: 1)")
+
+    args, rclone_args = parser.parse_known_args()
+
+    source = args.source
+    if source is None:
+        projects = load_projects()
+        if args.project not in projects:
+            projects = load_projects(refresh=True)
+        if args.project not in projects:
+            print(f"Error: Unknown project name '{args.project}'", file=sys.stderr)
+            sys.exit(1)
+        source = projects[args.project]
+
+    if not os.path.isdir(source):
+        print(f"Error: {source} not found or not accessible", file=sys.stderr)
+        sys.exit(1)
+
+    destination = f"{args.remote.rstrip('/')}/{args.project}"
+    print(f"Syncing {args.project} from {source} to {destination}...")
+    policy = load_policy(args.policy)
+    failed = []
+    for part in args.part or [None]:
+        if part is not None:
+            print(f"\n▶️  Part {part}")
+            if part != ROOT_FILES_PART and not os.path.isdir(os.path.join(source, part)):
+                # Removed since the shards were planned; a whole-project sync removes it from the remote
+                print(f"   ⚠️  {os.path.join(source, part)} no longer exists, skipping")
+                continue
+        ok = sync_project(
+            args.project, source, destination, part=part, full=args.full, full_every_days=args.full_every,
+            workers=args.workers, dry_run=args.dry_run,
+            # Checked before every part, as a long job can run into the next window
+            rclone_args=apply_policy(args.project, rclone_args, share=args.bwlimit_share, policy=policy)
+        )
+        if not ok:
+            failed.append(part or args.project)
+    if failed:
+        print(f"❌ rclone failed for {', '.join(failed)}; the previous manifests are kept so the next run retries them")
+        sys.exit(1)
+    print(f"✅ Sync of {args.project} complete")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Registry of HBS grid project spaces shared by the hbsgrid sizing and sync tools.
+
+Project spaces are discovered by listing every project root (/export/projects,
+/export/projects1, ...) in parallel for directories matching mmiller_*. The
+result is cached in the hbsgrid state directory so the scripts that consume it
+(scan_project_sizes.py, sync_single_project.sh, sync_all_project_spaces.sh)
+read one small JSON file instead of each searching the project roots.
+
+The cache is refreshed automatically once it is older than REGISTRY_MAX_AGE_HOURS,
+or on demand with --refresh. HBSGRID_PROJECT_ROOTS (colon-separated) and
+HBSGRID_PROJECT_PATTERN override where and what to look for.
+
+Usage:
+    python3 project_registry.py                      # Show registered projects
+    python3 project_registry.py --refresh            # Rediscover project spaces now
+    python3 project_registry.py --names              # One project name per line (for shell scripts)
+    python3 project_registry.py --path mmiller_peps  # Path of one project
+"""
+import os
+import sys
+import json
+import fnmatch
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+
+from size_index import STATE_DIR
+
+DEFAULT_PROJECT_ROOTS = [
+    "/export/projects",
+    "/export/projects1",
+    "/export/projects2",
+    "/export/projects3",
+    "/export/projects4",
+]
+PROJECT_ROOTS = os.environ.get("HBSGRID_PROJECT_ROOTS", ":".join(DEFAULT_PROJECT_ROOTS)).split(":")
+PROJECT_PATTERN = os.environ.get("HBSGRID_PROJECT_PATTERN", "mmiller_*")
+
+REGISTRY_PATH = STATE_DIR / "projects.json"
+REGISTRY_MAX_AGE_HOURS = 24
+
+
+def list_root(root, pattern):
+    """Project directories directly under one root, or None if the root is not readable"""
+    try:
+        with os.scandir(root) as entries:
+            return sorted(
+                entry.path for entry in entries
+                if fnmatch.fnmatch(entry.name, pattern) and entry.is_dir(follow_symlinks=False)
+            )
+    except OSError:
+        return None
+
+
+def discover_projects(roots=None, pattern=None):
+    """List all project roots at once.
+
+    Returns a registry dict with the project name -> path mapping, the directories
+    found per root (None for unreadable roots), and when discovery ran. A name
+    found under several roots is registered at the first root in order.
+    """
+    roots = roots or PROJECT_ROOTS
+    pattern = pattern or PROJECT_PATTERN
+    with ThreadPoolExecutor(max_workers=len(roots)) as executor:
+        found = dict(zip(roots, executor.map(lambda root: list_root(root, pattern), roots)))
+
+    projects = {}
+    duplicates = {}
+    for root in roots:
+        for path in found[root] or []:
+            name = os.path.basename(path)
+            if name in projects:
+                duplicates.setdefault(name, [projects[name]]).append(path)
+            else:
+                projects[name] = path
+
+    return {
+        "discovered_at": datetime.now(timezone.utc).isoformat(),
+        "pattern": pattern,
+        "roots": found,
+        "projects": dict(sorted(projects.items())),
+        "duplicates": duplicates,
+    }
+
+
+def save_registry(registry, path=REGISTRY_PATH):
+    """Write the registry atomically, since sync jobs may be reading it concurrently"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    temp_path.write_text(json.dumps(registry, indent=2))
+    os.replace(temp_path, path)
+
+
+def load_registry(refresh=False, max_age_hours=REGISTRY_MAX_AGE_HOURS, path=REGISTRY_PATH):
+    """Cached registry, rediscovered when missing, stale or refresh is set"""
+    path = Path(path)
+    if not refresh and path.exists():
+        registry = json.loads(path.read_text())
+        age = datetime.now(timezone.utc) - datetime.fromisoformat(registry["discovered_at"])
+        if age.total_seconds() <= max_age_hours * 3600:
+            return registry
+
+    registry = discover_projects()
+    save_registry(registry, path)
+    return registry
+
+
+def load_projects(refresh=False):
+    """Project name -> path for every registered project space"""
+    return load_registry(refresh=refresh)["projects"]
+
+
+def print_registry(registry):
+    print(f"Project spaces matching {registry['pattern']} "
+          f"(discovered {registry['discovered_at'][:19].replace('T', ' ')} UTC):")
+    print("==================================================")
+    for root, paths in registry["roots"].items():
+        print(f"\n{root}:")
+        if paths is None:
+            print("  not found or not accessible")
+        for path in paths or []:
+            print(f"  {path}")
+
+    for name, paths in registry["duplicates"].items():
+        print(f"\n⚠️  {name} exists in several roots, using {paths[0]}: {', '.join(paths[1:])} ignored")
+
+    print("\n==================================================")
+    print(f"Total projects registered: {len(registry['projects'])}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Discover and list HBS grid project spaces")
+    parser.add_argument("--refresh", action="store_true", help="Rediscover project spaces instead of using the cache")
+    parser.add_argument("--max-age", type=float, default=REGISTRY_MAX_AGE_HOURS,
+                        help=f"Rediscover when the cache is older than this many hours (default: {REGISTRY_MAX_AGE_HOURS})")
+    output = parser.add_mutually_exclusive_group()
+    output.add_argument("--names", action="store_true", help="Print project names only, one per line")
+    output.add_argument("--path", metavar="PROJECT", help="Print the path of one project")
+    output.add_argument("--json", action="store_true", help="Print the registry as JSON")
+
+    args = parser.parse_args()
+    registry = load_registry(refresh=args.refresh, max_age_hours=args.max_age)
+    projects = registry["projects"]
+
+    if args.names:
+        print("\n".join(projects))
+    elif args.path:
+        if args.path not in projects and not args.refresh:
+            # A project created since the last discovery
+            projects = load_registry(refresh=True)["projects"]
+        if args.path not in projects:
+            print(f"Error: Unknown project name '{args.path}'", file=sys.stderr)
+            print(f"Available projects: {', '.join(projects)}", file=sys.stderr)
+            sys.exit(1)
+        print(projects[args.path])
+    elif args.json:
+        print(json.dumps(registry, indent=2))
+    else:
+        print_registry(registry)
+
+
+if __name__ == "__main__":
+    main()
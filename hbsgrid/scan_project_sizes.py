@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+Scan HBS grid project spaces in parallel and report sizes.
+
+Walks all project spaces at once with a shared pool of os.scandir threads and
+reports, in one pass, each project's total size and file count, a breakdown by
+subdirectory, and the largest files.
+
+Sizes are apparent file sizes (like du -sb, but without counting directory
+entries themselves or collapsing hard links).
+
+Results are kept in a per-directory index (see size_index.py), so later scans
+only re-list directories whose mtime changed and reuse cached totals for the rest.
+Each run's totals are also recorded for size_growth_report.py.
+
+Usage:
+    python3 scan_project_sizes.py                      # All registered projects (see project_registry.py)
+    python3 scan_project_sizes.py mmiller_peps         # Selected projects
+    python3 scan_project_sizes.py --depth 2 --top 20   # Deeper breakdown, more large files
+    python3 scan_project_sizes.py --json sizes.json    # Also save the full results
+    python3 scan_project_sizes.py --full               # Re-list every directory
+"""
+import os
+import sys
+import json
+import heapq
+import argparse
+from datetime import datetime
+from pathlib import Path
+
+from fs_walk import DEFAULT_WORKERS, walk_tree
+from size_index import DEFAULT_INDEX_PATH, INDEX_TOP_FILES, SizeIndex
+from size_growth_report import DEFAULT_HISTORY_PATH, record_scan
+from project_registry import load_projects
+
+TB = 1024 ** 4
+
+
+def human_readable(num_bytes):
+    """Convert bytes to human readable format"""
+    for unit, scale in (("TB", 1024 ** 4), ("GB", 1024 ** 3), ("MB", 1024 ** 2), ("KB", 1024)):
+        if num_bytes >= scale:
+            return f"{num_bytes / scale:.2f}{unit}"
+    return f"{num_bytes}B"
+
+
+def relative_path(path, root):
+    """Path relative to root, with '.' for the root itself"""
+    return os.path.relpath(path, root)
+
+
+def path_depth(relpath):
+    return 0 if relpath == "." else relpath.count(os.sep) + 1
+
+
+def scan_projects(projects, workers=DEFAULT_WORKERS, depth=1, top_n=10, index=None):
+    """Scan several project roots in one parallel walk.
+
+    projects maps project name to path. With a SizeIndex, directories whose mtime
+    is unchanged are answered from the index and the index is updated afterwards.
+    Returns a dict of per-project results with total bytes/files/dirs, unreadable
+    directories, per-directory totals down to the given depth, and the top_n
+    largest files.
+    """
+    root_to_project = {str(path): name for name, path in projects.items()}
+    own_totals = {name: {} for name in projects}
+    largest = {name: [] for name in projects}
+    errors = {name: [] for name in projects}
+    index_entries = {name: [] for name in projects}
+    relisted = {name: 0 for name in projects}
+    # Directories keep enough of their largest files for the index to answer later scans
+    dir_top_n = max(top_n, INDEX_TOP_FILES) if index is not None else top_n
+
+    walk_kwargs = {"workers": workers}
+    if index is not None:
+        index.load(root_to_project)
+        walk_kwargs["lister"] = index.lister
+
+    for listing in walk_tree(list(root_to_project), **walk_kwargs):
+        project = root_to_project[listing.root]
+        relpath = relative_path(listing.path, listing.root)
+
+        if listing.error is not None:
+            errors[project].append(relpath)
+            continue
+
+        if listing.summary is not None:
+            own_bytes, own_files, dir_largest = listing.summary
+        else:
+            own_bytes = sum(size for _, size, _ in listing.files)
+            own_files = len(listing.files)
+            dir_largest = heapq.nlargest(dir_top_n, ((size, name) for name, size, _ in listing.files))
+            relisted[project] += 1
+
+        # Keep a bounded min-heap of the largest files per project
+        for size, name in dir_largest:
+            entry = (size, os.path.join(relpath, name) if relpath != "." else name)
+            if len(largest[project]) < top_n:
+                heapq.heappush(largest[project], entry)
+            elif size > largest[project][0][0]:
+                heapq.heapreplace(largest[project], entry)
+        own_totals[project][relpath] = (own_bytes, own_files)
+
+        if index is not None:
+            index_entries[project].append((
+                listing.path, listing.mtime_ns, own_bytes, own_files, listing.subdirs,
+                [list(entry) for entry in dir_largest], listing.summary is None
+            ))
+
+    if index is not None:
+        for name, path in projects.items():
+            # Leave the index alone for roots that could not be read at all
+            if "." in own_totals[name]:
+                index.save(path, index_entries[name])
+
+    results = {}
+    for name, path in projects.items():
+        # Roll directory totals up to their parents, deepest first
+        totals = {relpath: list(own) for relpath, own in own_totals[name].items()}
+        for relpath in sorted(totals, key=path_depth, reverse=True):
+            if relpath == ".":
+                continue
+            parent = os.path.dirname(relpath) or "."
+            if parent in totals:
+                totals[parent][0] += totals[relpath][0]
+                totals[parent][1] += totals[relpath][1]
+
+        root_bytes, root_files = totals.get(".", (0, 0))
+        results[name] = {
+            "project": name,
+            "path": str(path),
+            "accessible": "." in totals,
+            "bytes": root_bytes,
+            "files": root_files,
+            "dirs": len(totals),
+            "relisted_dirs": relisted[name],
+            "unreadable_dirs": sorted(errors[name]),
+            "subdirs": {
+                relpath: {"bytes": total[0], "files": total[1]}
+                for relpath, total in totals.items()
+                if 0 < path_depth(relpath) <= depth
+            },
+            "largest_files": [
+                {"path": file_path, "bytes": size}
+                for size, file_path in sorted(largest[name], reverse=True)
+            ],
+        }
+    return results
+
+
+def print_report(results, top_dirs=10):
+    """Print per-project totals, largest subdirectories and files, and the overall summary"""
+    accessible = [r for r in results.values() if r["accessible"]]
+    inaccessible = [r for r in results.values() if not r["accessible"]]
+
+    for result in sorted(results.values(), key=lambda r: r["bytes"], reverse=True):
+        if not result["accessible"]:
+            print(f"{result['project']}: Directory not found or not readable at {result['path']}")
+            continue
+
+        print(f"\n{result['project']} ({result['path']})")
+        print(f"  {human_readable(result['bytes']):>10}  {result['bytes'] / TB:.4f} TB, "
+              f"{result['files']:,} files in {result['dirs']:,} directories "
+              f"({result['relisted_dirs']:,} re-listed)")
+        if result["unreadable_dirs"]:
+            print(f"  ⚠️  {len(result['unreadable_dirs'])} unreadable directories (permission denied)")
+
+        subdirs = sorted(result["subdirs"].items(), key=lambda item: item[1]["bytes"], reverse=True)
+        if subdirs:
+            print("  Largest subdirectories:")
+            for relpath, total in subdirs[:top_dirs]:
+                print(f"    {human_readable(total['bytes']):>10}  {total['files']:>10,} files  {relpath}")
+
+        if result["largest_files"]:
+            print("  Largest files:")
+            for entry in result["largest_files"]:
+                print(f"    {human_readable(entry['bytes']):>10}  {entry['path']}")
+
+    total_bytes = sum(r["bytes"] for r in accessible)
+    print("")
+    print("================================================")
+    print("SUMMARY:")
+    print(f"  Accessible projects: {len(accessible)}")
+    print(f"  Inaccessible projects: {len(inaccessible)}")
+
+    if accessible:
+        print("")
+        print("TOTAL SIZE:")
+        print(f"  Raw bytes: {total_bytes}")
+        print(f"  Human readable: {human_readable(total_bytes)}")
+        print(f"  Files: {sum(r['files'] for r in accessible):,}")
+        print(f"  Gigabytes: {total_bytes / 1024 ** 3:.2f} GB")
+        print(f"  Terabytes: {total_bytes / TB:.4f} TB")
+
+        if inaccessible:
+            print("")
+            print(f"⚠️  Note: Total excludes {len(inaccessible)} inaccessible project(s)")
+    else:
+        print("❌ No accessible projects found!")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scan HBS grid project spaces in parallel and report sizes")
+    parser.add_argument("projects", nargs="*", help="Project names to scan (default: all)")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS,
+                        help=f"Number of scanning threads (default: {DEFAULT_WORKERS})")
+    parser.add_argument("--depth", type=int, default=1,
+                        help="Report subdirectory totals down to this depth (default: 1)")
+    parser.add_argument("--top", type=int, default=10,
+                        help="Number of largest files and subdirectories to show per project (default: 10)")
+    parser.add_argument("--json", help="Write full results to this JSON file")
+    parser.add_argument("--index", default=str(DEFAULT_INDEX_PATH),
+                        help=f"Size index database (default: {DEFAULT_INDEX_PATH})")
+    parser.add_argument("--no-index", action="store_true",
+                        help="Walk everything without reading or updating the size index")
+    parser.add_argument("--full", action="store_true",
+                        help="Re-list every directory, refreshing the size index")
+    parser.add_argument("--max-age", type=float,
+                        help="Re-list directories whose index entry is older than this many days")
+    parser.add_argument("--history", default=str(DEFAULT_HISTORY_PATH),
+                        help=f"Scan history database for growth reports (default: {DEFAULT_HISTORY_PATH})")
+    parser.add_argument("--no-history", action="store_true",
+                        help="Do not record this scan in the scan history")
+
+    parser.add_argument("--refresh-projects", action="store_true",
+                        help="Rediscover project spaces instead of using the cached registry")
+
+    args = parser.parse_args()
+
+    registered = load_projects(refresh=args.refresh_projects)
+    unknown = [name for name in args.projects if name not in registered]
+    if unknown and not args.refresh_projects:
+        registered = load_projects(refresh=True)
+        unknown = [name for name in args.projects if name not in registered]
+    if unknown:
+        print(f"Error: Unknown project(s): {', '.join(unknown)}", file=sys.stderr)
+        print(f"Available projects: {', '.join(registered)}", file=sys.stderr)
+        sys.exit(1)
+    projects = {name: registered[name] for name in (args.projects or registered)}
+
+    print("Checking sizes of all HBS grid project spaces...")
+    print("================================================")
+
+    index = None
+    if not args.no_index:
+        index = SizeIndex(args.index, max_age_days=0 if args.full else args.max_age)
+
+    try:
+        results = scan_projects(projects, workers=args.workers, depth=args.depth, top_n=args.top, index=index)
+    finally:
+        if index is not None:
+            index.close()
+    print_report(results, top_dirs=args.top)
+
+    if not args.no_history:
+        scan_id = record_scan(results, args.history)
+        print(f"\nRecorded as scan {scan_id} in {args.history} (see size_growth_report.py)")
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2))
+        print(f"\nFull results saved to {args.json}")
+
+    print(f"\nScan completed at {datetime.now().strftime('%a %b %d %H:%M:%S %Y')}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+Storage growth report over historical project space scans.
+
+scan_project_sizes.py records every scan's per-project and per top-level
+subdirectory totals here. This script compares the latest scan of each project
+with an earlier one and reports growth in bytes, files and bytes per day,
+flagging the fastest-growing paths.
+
+Usage:
+    python3 size_growth_report.py                   # Compare with scans at least 7 days older
+    python3 size_growth_report.py --days 30         # Monthly growth
+    python3 size_growth_report.py --top 20          # Show more of the fastest-growing paths
+    python3 size_growth_report.py --list            # List recorded scans
+"""
+import os
+import sys
+import sqlite3
+import argparse
+from datetime import datetime, timezone
+from pathlib import Path
+
+from size_index import STATE_DIR
+
+DEFAULT_HISTORY_PATH = STATE_DIR / "size_history.sqlite"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scans (
+    scan_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    scanned_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS project_sizes (
+    scan_id INTEGER NOT NULL REFERENCES scans (scan_id),
+    project TEXT NOT NULL,
+    path TEXT NOT NULL,
+    bytes INTEGER NOT NULL,
+    files INTEGER NOT NULL,
+    PRIMARY KEY (scan_id, project)
+);
+CREATE TABLE IF NOT EXISTS subdir_sizes (
+    scan_id INTEGER NOT NULL REFERENCES scans (scan_id),
+    project TEXT NOT NULL,
+    subdir TEXT NOT NULL,
+    bytes INTEGER NOT NULL,
+    files INTEGER NOT NULL,
+    PRIMARY KEY (scan_id, project, subdir)
+);
+"""
+
+
+def connect(path=DEFAULT_HISTORY_PATH):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    connection = sqlite3.connect(path)
+    connection.executescript(SCHEMA)
+    return connection
+
+
+def human_readable(num_bytes):
+    """Convert a (possibly negative) byte count to human readable format"""
+    sign = "-" if num_bytes < 0 else ""
+    num_bytes = abs(num_bytes)
+    for unit, scale in (("TB", 1024 ** 4), ("GB", 1024 ** 3), ("MB", 1024 ** 2), ("KB", 1024)):
+        if num_bytes >= scale:
+            return f"{sign}{num_bytes / scale:.2f}{unit}"
+    return f"{sign}{num_bytes:.0f}B"
+
+
+def record_scan(results, history_path=DEFAULT_HISTORY_PATH, scanned_at=None):
+    """Store one scan_project_sizes.scan_projects() result set; returns the scan id.
+
+    Only accessible projects and their top-level subdirectories are recorded.
+    """
+    scanned_at = scanned_at or datetime.now(timezone.utc)
+    connection = connect(history_path)
+    with connection:
+        scan_id = connection.execute(
+            "INSERT INTO scans (scanned_at) VALUES (?)", (scanned_at.isoformat(),)
+        ).lastrowid
+        for result in results.values():
+            if not result["accessible"]:
+                continue
+            connection.execute(
+                "INSERT INTO project_sizes VALUES (?, ?, ?, ?, ?)",
+                (scan_id, result["project"], result["path"], result["bytes"], result["files"])
+            )
+            connection.executemany(
+                "INSERT INTO subdir_sizes VALUES (?, ?, ?, ?, ?)",
+                [
+                    (scan_id, result["project"], subdir, total["bytes"], total["files"])
+                    for subdir, total in result["subdirs"].items()
+                    if os.sep not in subdir
+                ]
+            )
+    connection.close()
+    return scan_id
+
+
+def project_scans(connection, project):
+    """(scan_id, scanned_at) for every recorded scan of a project, oldest first"""
+    rows = connection.execute(
+        "SELECT s.scan_id, s.scanned_at FROM scans s JOIN project_sizes p ON p.scan_id = s.scan_id "
+        "WHERE p.project = ? ORDER BY s.scanned_at", (project,)
+    )
+    return [(scan_id, datetime.fromisoformat(scanned_at)) for scan_id, scanned_at in rows]
+
+
+def latest_sizes(connection, project):
+    """Totals from a project's most recent scan, or None if it was never scanned.
+
+    Returns {"bytes", "files", "scanned_at", "subdirs": {name: (bytes, files)}}.
+    """
+    scans = project_scans(connection, project)
+    if not scans:
+        return None
+    scan_id, scanned_at = scans[-1]
+    size, files = connection.execute(
+        "SELECT bytes, files FROM project_sizes WHERE scan_id = ? AND project = ?", (scan_id, project)
+    ).fetchone()
+    subdirs = {
+        subdir: (subdir_bytes, subdir_files) for subdir, subdir_bytes, subdir_files in connection.execute(
+            "SELECT subdir, bytes, files FROM subdir_sizes WHERE scan_id = ? AND project = ?", (scan_id, project)
+        )
+    }
+    return {"bytes": size, "files": files, "scanned_at": scanned_at, "subdirs": subdirs}
+
+
+def pick_baseline(scans, days):
+    """Latest scan at least `days` older than the newest one, else the oldest scan"""
+    latest_id, latest_at = scans[-1]
+    older = [(scan_id, at) for scan_id, at in scans[:-1] if (latest_at - at).total_seconds() >= days * 86400]
+    if older:
+        return older[-1]
+    return scans[0] if len(scans) > 1 else None
+
+
+def growth_entry(project, path, old, new, elapsed_days):
+    """Growth between two (bytes, files) totals; missing totals count as zero"""
+    old_bytes, old_files = old or (0, 0)
+    new_bytes, new_files = new or (0, 0)
+    delta = new_bytes - old_bytes
+    return {
+        "project": project,
+        "path": path,
+        "old_bytes": old_bytes,
+        "new_bytes": new_bytes,
+        "delta_bytes": delta,
+        "delta_files": new_files - old_files,
+        "bytes_per_day": delta / elapsed_days if elapsed_days else 0,
+        # None marks a path that appeared since the baseline
+        "percent": (delta / old_bytes * 100) if old_bytes else (None if new_bytes else 0.0),
+    }
+
+
+def compute_growth(connection, days):
+    """Compare each project's latest scan with its baseline.
+
+    Returns (projects, subdirs): lists of growth entries for whole projects and for
+    their top-level subdirectories, each with the compared scan dates.
+    """
+    projects = []
+    subdirs = []
+    names = [row[0] for row in connection.execute("SELECT DISTINCT project FROM project_sizes ORDER BY project")]
+
+    for project in names:
+        scans = project_scans(connection, project)
+        baseline = pick_baseline(scans, days)
+        if baseline is None:
+            continue
+        (old_id, old_at), (new_id, new_at) = baseline, scans[-1]
+        elapsed_days = (new_at - old_at).total_seconds() / 86400
+
+        totals = {}
+        for scan_id in (old_id, new_id):
+            totals[scan_id] = connection.execute(
+                "SELECT bytes, files FROM project_sizes WHERE scan_id = ? AND project = ?", (scan_id, project)
+            ).fetchone()
+        entry = growth_entry(project, ".", totals[old_id], totals[new_id], elapsed_days)
+        entry.update({"from": old_at, "to": new_at, "days": elapsed_days})
+        projects.append(entry)
+
+        subdir_totals = {}
+        for scan_id in (old_id, new_id):
+            subdir_totals[scan_id] = {
+                subdir: (size, files) for subdir, size, files in connection.execute(
+                    "SELECT subdir, bytes, files FROM subdir_sizes WHERE scan_id = ? AND project = ?",
+                    (scan_id, project)
+                )
+            }
+        for subdir in set(subdir_totals[old_id]) | set(subdir_totals[new_id]):
+            subdirs.append(growth_entry(
+                project, subdir, subdir_totals[old_id].get(subdir), subdir_totals[new_id].get(subdir), elapsed_days
+            ))
+
+    return projects, subdirs
+
+
+def format_percent(entry):
+    return "new" if entry["percent"] is None else f"{entry['percent']:+.1f}%"
+
+
+def print_report(projects, subdirs, top_n, flag_percent, flag_bytes_per_day):
+    print("## Storage Growth Report\n")
+    print(f"**Date:** {datetime.now().strftime('%Y-%m-%d')}\n")
+
+    if not projects:
+        print("Not enough scan history yet: each project needs at least two recorded scans.")
+        return
+
+    print("| Project | From | To | Size | Change | Change % | Per Day | Files Change |")
+    print("|---------|------|----|------|--------|----------|---------|--------------|")
+    for entry in sorted(projects, key=lambda e: e["bytes_per_day"], reverse=True):
+        print(f"| {entry['project']} | {entry['from']:%Y-%m-%d} | {entry['to']:%Y-%m-%d} | "
+              f"{human_readable(entry['new_bytes'])} | {human_readable(entry['delta_bytes'])} | "
+              f"{format_percent(entry)} | {human_readable(entry['bytes_per_day'])}/day | {entry['delta_files']:+,} |")
+
+    total_delta = sum(e["delta_bytes"] for e in projects)
+    total_rate = sum(e["bytes_per_day"] for e in projects)
+    print(f"\n**Total change:** {human_readable(total_delta)} ({human_readable(total_rate)}/day)")
+
+    print("\n### Fastest-Growing Paths\n")
+    growing = sorted((e for e in subdirs if e["delta_bytes"] > 0), key=lambda e: e["bytes_per_day"], reverse=True)
+    if not growing:
+        print("No top-level subdirectory grew between the compared scans.")
+        return
+
+    print("| Project | Path | Size | Change | Change % | Per Day | Flag |")
+    print("|---------|------|------|--------|----------|---------|------|")
+    for entry in growing[:top_n]:
+        flagged = (
+            entry["bytes_per_day"] >= flag_bytes_per_day
+            or entry["percent"] is None
+            or entry["percent"] >= flag_percent
+        )
+        print(f"| {entry['project']} | {entry['path']} | {human_readable(entry['new_bytes'])} | "
+              f"{human_readable(entry['delta_bytes'])} | {format_percent(entry)} | "
+              f"{human_readable(entry['bytes_per_day'])}/day | {'🚩' if flagged else ''} |")
+
+
+def list_scans(connection):
+    rows = connection.execute(
+        "SELECT s.scan_id, s.scanned_at, COUNT(p.project), COALESCE(SUM(p.bytes), 0) "
+        "FROM scans s LEFT JOIN project_sizes p ON p.scan_id = s.scan_id GROUP BY s.scan_id ORDER BY s.scanned_at"
+    )
+    print("| Scan | Date | Projects | Total |")
+    print("|------|------|----------|-------|")
+    for scan_id, scanned_at, project_count, total in rows:
+        print(f"| {scan_id} | {scanned_at[:19]} | {project_count} | {human_readable(total)} |")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report storage growth between recorded project space scans")
+    parser.add_argument("--days", type=float, default=7,
+                        help="Compare with the latest scan at least this many days older (default: 7)")
+    parser.add_argument("--top", type=int, default=10,
+                        help="Number of fastest-growing paths to show (default: 10)")
+    parser.add_argument("--flag-percent", type=float, default=10,
+                        help="Flag paths that grew by at least this percent (default: 10)")
+    parser.add_argument("--flag-gb-per-day", type=float, default=10,
+                        help="Flag paths growing at least this many GB per day (default: 10)")
+    parser.add_argument("--history", default=str(DEFAULT_HISTORY_PATH),
+                        help=f"Scan history database (default: {DEFAULT_HISTORY_PATH})")
+    parser.add_argument("--list", action="store_true", help="List recorded scans and exit")
+
+    args = parser.parse_args()
+
+    if not Path(args.history).exists():
+        print(f"Error: Scan history not found at {args.history}", file=sys.stderr)
+        print("Please run scan_project_sizes.py (or check_project_sizes.sh) first", file=sys.stderr)
+        sys.exit(1)
+
+    connection = connect(args.history)
+    if args.list:
+        list_scans(connection)
+        return
+
+    projects, subdirs = compute_growth(connection, args.days)
+    print_report(projects, subdirs, args.top, args.flag_percent, args.flag_gb_per_day * 1024 ** 3)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Persistent per-directory size index for incremental project space scans.
+
+Each scanned directory is stored with its mtime, its own file bytes and count,
+its subdirectory names and its largest files. On the next scan a directory
+whose mtime is unchanged is answered from the index with a single stat instead
+of being listed again, and totals are rolled up from the cached children.
+
+A directory's mtime only changes when entries are added, removed or renamed in
+it, so files rewritten in place keep their old size until the directory is
+re-listed; run with --full periodically (or --max-age) to catch those.
+"""
+import os
+import json
+import time
+import sqlite3
+from pathlib import Path
+
+from fs_walk import list_directory
+
+# Local state shared by the hbsgrid tools
+STATE_DIR = Path(os.environ.get("HBSGRID_STATE_DIR", Path.home() / ".hbsgrid"))
+DEFAULT_INDEX_PATH = STATE_DIR / "size_index.sqlite"
+
+# Largest files kept per directory, enough to answer any --top up to this value
+INDEX_TOP_FILES = 25
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS directories (
+    path TEXT PRIMARY KEY,
+    root TEXT NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    own_bytes INTEGER NOT NULL,
+    own_files INTEGER NOT NULL,
+    subdirs TEXT NOT NULL,
+    largest_files TEXT NOT NULL,
+    listed_at REAL NOT NULL,
+    seen_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS directories_root ON directories (root);
+"""
+
+
+class SizeIndex:
+    """SQLite-backed cache of per-directory scan summaries"""
+
+    def __init__(self, path=DEFAULT_INDEX_PATH, max_age_days=None):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(self.path)
+        self.connection.executescript(SCHEMA)
+        # Entries listed longer ago than this are re-listed even if the mtime matches
+        self.max_age_seconds = max_age_days * 86400 if max_age_days is not None else None
+        self.cache = {}
+
+    def load(self, roots):
+        """Load cached entries for the given roots into memory for use by lister()"""
+        now = time.time()
+        for root in roots:
+            rows = self.connection.execute(
+                "SELECT path, mtime_ns, own_bytes, own_files, subdirs, largest_files, listed_at "
+                "FROM directories WHERE root = ?", (str(root),)
+            )
+            for path, mtime_ns, own_bytes, own_files, subdirs, largest_files, listed_at in rows:
+                if self.max_age_seconds is not None and now - listed_at > self.max_age_seconds:
+                    continue
+                self.cache[path] = (
+                    mtime_ns, own_bytes, own_files, json.loads(subdirs),
+                    [tuple(entry) for entry in json.loads(largest_files)]
+                )
+
+    def lister(self, path):
+        """fs_walk lister that reuses the cached entry when the directory mtime is unchanged.
+
+        Cached directories are returned with no files and a (own_bytes, own_files,
+        largest_files) summary; others are listed normally.
+        """
+        cached = self.cache.get(path)
+        if cached is not None:
+            mtime_ns = os.stat(path).st_mtime_ns
+            if mtime_ns == cached[0]:
+                return mtime_ns, [], cached[3], cached[1:3] + (cached[4],)
+        return list_directory(path)
+
+    def save(self, root, entries):
+        """Store scan results for one root and drop directories that no longer exist.
+
+        entries is a list of (path, mtime_ns, own_bytes, own_files, subdirs,
+        largest_files, relisted) for every directory seen in the scan.
+        """
+        now = time.time()
+        with self.connection:
+            for path, mtime_ns, own_bytes, own_files, subdirs, largest_files, relisted in entries:
+                if relisted:
+                    self.connection.execute(
+                        "INSERT OR REPLACE INTO directories VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        (path, str(root), mtime_ns, own_bytes, own_files, json.dumps(subdirs),
+                         json.dumps(largest_files), now, now)
+                    )
+                else:
+                    self.connection.execute("UPDATE directories SET seen_at = ? WHERE path = ?", (now, path))
+            self.connection.execute(
+                "DELETE FROM directories WHERE root = ? AND seen_at < ?", (str(root), now)
+            )
+
+    def close(self):
+        self.connection.close()
@@ -1,7 +1,14 @@
 #!/bin/bash
 
 # Master script to sync all HBS grid project spaces to Dropbox simultaneously
-# This script submits individual sync jobs using bsub for parallel execution
+# This script submits individual sync jobs using bsub for parallel execution,
+# or runs them as local processes where bsub is not available
+# Usage: ./sync_all_project_spaces.sh [project_name ...] [--jobs N] [--no-shard] [--dry-run] [--full]
+#                                     [--executor auto|bsub|local|dry-run] [--max-parallel N] [--scan]
+#
+# Jobs are planned by sync_orchestrator.py, which splits large project spaces
+# into size-balanced shards of top-level directories using the latest scan from
+# check_project_sizes.sh, and submits one job per shard.
 
 echo "Starting parallel sync of all HBS grid project spaces to Dropbox..."
 
@@ -18,47 +25,4 @@ fi
 # Make sure the single sync script is executable
 chmod +x "$SINGLE_SYNC_SCRIPT"
 
-# Array of all project names
-PROJECTS=(
-    "mmiller_commitee_votes"
-    "mmiller_peps"
-    "mmiller_colonialism"
-    "mmiller_emrisk"
-    "mmiller_bill_probability"
-    "mmiller_foreign_influence"
-    "mmiller_ownership_chains"
-)
-
-# Submit each project sync as a separate bsub job
-JOB_IDS=()
-for project in "${PROJECTS[@]}"; do
-    echo "Submitting sync job for $project..."
-    
-    # Submit job and capture job ID
-    JOB_OUTPUT=$(bsub -J "sync_${project}" -o "${project}_sync.log" -e "${project}_sync.err" "$SINGLE_SYNC_SCRIPT" "$project" 2>&1)
-    
-    if [ $? -eq 0 ]; then
-        # Extract job ID from bsub output (format: "Job <12345> is submitted to queue <normal>.")
-        JOB_ID=$(echo "$JOB_OUTPUT" | grep -o 'Job <[0-9]*>' | grep -o '[0-9]*')
-        JOB_IDS+=("$JOB_ID")
-        echo "  ✓ Job $JOB_ID submitted for $project"
-    else
-        echo "  ✗ Failed to submit job for $project"
-        echo "    Error: $JOB_OUTPUT"
-    fi
-done
-
-echo ""
-echo "All sync jobs submitted!"
-echo "Job IDs: ${JOB_IDS[*]}"
-echo ""
-echo "Monitor job status with:"
-echo "  bjobs ${JOB_IDS[*]}"
-echo ""
-echo "View logs in current directory:"
-for project in "${PROJECTS[@]}"; do
-    echo "  ${project}: ${project}_sync.log (output), ${project}_sync.err (errors)"
-done
-echo ""
-echo "Wait for all jobs to complete with:"
-echo "  bwait ${JOB_IDS[*]}"
+exec python3 "$SCRIPT_DIR/sync_orchestrator.py" "$@"
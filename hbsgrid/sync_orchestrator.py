@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+"""
+Plan and submit size-balanced sync jobs for all HBS grid project spaces.
+
+Submitting one job per project leaves the total sync time at the mercy of the
+largest project. Instead, the sizes from the latest recorded scan (see
+scan_project_sizes.py) are used to split projects larger than the target shard
+size into shards of top-level directories, balanced largest-first onto the
+lightest shard. Each shard is submitted as its own job running
+sync_single_project.sh with --part arguments, and gets rclone --transfers and
+--checkers tuned to its average file size.
+
+Jobs go to the LSF grid with bsub when it is available and otherwise run as
+local processes, at most --max-parallel at a time (see job_executors.py);
+--executor picks one explicitly. Bandwidth limits and transfer/checker caps
+from the sync policy (see sync_policy.py) are applied by each job as it starts. With --scan, project sizes are refreshed by a
+scan job on the same executor before planning.
+
+The target shard size is the total size of all projects divided by --jobs (but
+at least --min-shard-gb), so jobs end up roughly equal and total sync time
+approaches total bytes over aggregate bandwidth.
+
+Logs of every job go to one run directory under ~/.hbsgrid/sync_logs/. The
+orchestrator waits for the jobs to finish (unless --no-wait) and then prints
+the per-project completion report from sync_report.py.
+
+Sharded projects only sync the top-level directories that exist at submission
+time; run with --no-shard now and then (or sync_single_project.sh <project>
+--full) so directories removed from a project are also removed from the remote.
+
+Usage:
+    python3 sync_orchestrator.py                    # Plan and submit all projects
+    python3 sync_orchestrator.py --dry-run          # Show the plan only
+    python3 sync_orchestrator.py --jobs 32          # Spread over more jobs
+    python3 sync_orchestrator.py mmiller_peps       # Selected projects
+    python3 sync_orchestrator.py --no-wait          # Submit and exit; report later with sync_report.py
+    python3 sync_orchestrator.py --executor local --max-parallel 2 --remote /tmp/remote
+    python3 sync_orchestrator.py --scan             # Scan sizes first, then plan and sync
+"""
+import os
+import sys
+import math
+import argparse
+from datetime import datetime
+
+from project_registry import load_projects
+from size_growth_report import DEFAULT_HISTORY_PATH, connect, human_readable, latest_sizes
+from manifest_sync import ROOT_FILES_PART
+from sync_report import SYNC_LOG_DIR, job_results, print_report, save_run
+from job_executors import DEFAULT_LOCAL_PARALLEL, DEFAULT_POLL_INTERVAL, EXECUTORS, make_executor
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+SINGLE_SYNC_SCRIPT = os.path.join(SCRIPT_DIR, "sync_single_project.sh")
+SCAN_SCRIPT = os.path.join(SCRIPT_DIR, "scan_project_sizes.py")
+
+DEFAULT_JOBS = 16
+DEFAULT_MIN_SHARD_GB = 100
+
+# (largest average file size in bytes, --transfers, --checkers): many small files
+# are bound by per-file round trips, a few large ones by bandwidth
+TUNING_TIERS = [
+    (1024 ** 2, 32, 64),
+    (64 * 1024 ** 2, 16, 32),
+    (None, 8, 16),
+]
+# Used when there is no scan data to go by (rclone's own defaults)
+DEFAULT_TUNING = (4, 8)
+
+
+def tune_rclone(size, files):
+    """(--transfers, --checkers) for a shard with the given total bytes and file count"""
+    if not files:
+        return DEFAULT_TUNING
+    average = size / files
+    for limit, transfers, checkers in TUNING_TIERS:
+        if limit is None or average <= limit:
+            return transfers, checkers
+
+
+def top_level_dirs(path):
+    """Names of the directories directly under a project root, as they are now"""
+    with os.scandir(path) as entries:
+        return sorted(entry.name for entry in entries if entry.is_dir(follow_symlinks=False))
+
+
+def project_parts(path, sizes):
+    """(part, bytes, files) for each top-level directory plus the root files.
+
+    Directories created since the last scan have no size yet and count as empty.
+    """
+    parts = []
+    for name in top_level_dirs(path):
+        size, files = sizes["subdirs"].get(name, (0, 0))
+        parts.append((name, size, files))
+    root_bytes = max(sizes["bytes"] - sum(size for _, size, _ in parts), 0)
+    root_files = max(sizes["files"] - sum(files for _, _, files in parts), 0)
+    parts.append((ROOT_FILES_PART, root_bytes, root_files))
+    return parts
+
+
+def balance_parts(parts, shard_count):
+    """Assign parts to shards largest first, each to the currently lightest shard"""
+    shards = [{"parts": [], "bytes": 0, "files": 0} for _ in range(shard_count)]
+    for name, size, files in sorted(parts, key=lambda part: part[1], reverse=True):
+        shard = min(shards, key=lambda s: s["bytes"])
+        shard["parts"].append(name)
+        shard["bytes"] += size
+        shard["files"] += files
+    return [shard for shard in shards if shard["parts"]]
+
+
+def plan_syncs(projects, history_path=DEFAULT_HISTORY_PATH, jobs=DEFAULT_JOBS,
+               min_shard_bytes=DEFAULT_MIN_SHARD_GB * 1024 ** 3, shard=True):
+    """Split projects into sync jobs.
+
+    Returns a list of jobs: {"project", "name", "parts" (None for the whole
+    project), "shards", "bytes", "files", "transfers", "checkers", "sized"}.
+    """
+    connection = connect(history_path)
+    sizes = {name: latest_sizes(connection, name) for name in projects}
+    connection.close()
+
+    total = sum(s["bytes"] for s in sizes.values() if s)
+    target = max(total / jobs if jobs else total, min_shard_bytes, 1)
+
+    plan = []
+    for name, path in projects.items():
+        project_sizes = sizes[name]
+        if project_sizes is None:
+            plan.append({"project": name, "name": name, "parts": None, "shards": 1, "bytes": 0, "files": 0,
+                         "transfers": DEFAULT_TUNING[0], "checkers": DEFAULT_TUNING[1], "sized": False})
+            continue
+
+        shard_count = math.ceil(project_sizes["bytes"] / target) if shard else 1
+        parts = []
+        if shard_count > 1:
+            try:
+                parts = project_parts(path, project_sizes)
+            except OSError:
+                # Leave it to the sync job to report an unreadable project
+                pass
+        shard_count = min(shard_count, len(parts))
+        if shard_count <= 1:
+            shards = [{"parts": None, "bytes": project_sizes["bytes"], "files": project_sizes["files"]}]
+        else:
+            shards = balance_parts(parts, shard_count)
+
+        for index, shard_plan in enumerate(shards, 1):
+            transfers, checkers = tune_rclone(shard_plan["bytes"], shard_plan["files"])
+            plan.append({
+                "project": name,
+                "name": name if len(shards) == 1 else f"{name}_{index}of{len(shards)}",
+                "parts": shard_plan["parts"],
+                "shards": len(shards),
+                "bytes": shard_plan["bytes"],
+                "files": shard_plan["files"],
+                "transfers": transfers,
+                "checkers": checkers,
+                "sized": True,
+            })
+    return plan
+
+
+def job_command(job, extra_args=()):
+    command = [SINGLE_SYNC_SCRIPT, job["project"]]
+    for part in job["parts"] or []:
+        command += ["--part", part]
+    if job["shards"] > 1:
+        # Shards of one project run at once and split its bandwidth budget
+        command += ["--bwlimit-share", str(job["shards"])]
+    command += ["--transfers", str(job["transfers"]), "--checkers", str(job["checkers"])]
+    return command + list(extra_args)
+
+
+def print_plan(plan):
+    print("| Job | Size | Files | Parts | Transfers | Checkers |")
+    print("|-----|------|-------|-------|-----------|----------|")
+    for job in sorted(plan, key=lambda j: j["bytes"], reverse=True):
+        size = human_readable(job["bytes"]) if job["sized"] else "not scanned"
+        parts = "whole project" if job["parts"] is None else f"{len(job['parts'])} top-level entries"
+        print(f"| {job['name']} | {size} | {job['files']:,} | {parts} | {job['transfers']} | {job['checkers']} |")
+
+
+def scan_sizes(executor, projects, history_path):
+    """Run scan_project_sizes.py for the projects as one job and wait for it; returns True on success"""
+    scan_dir = SYNC_LOG_DIR / "scans"
+    scan_dir.mkdir(parents=True, exist_ok=True)
+    log_path = scan_dir / f"{datetime.now():%Y%m%d-%H%M%S}.log"
+    command = ["python3", SCAN_SCRIPT, "--history", str(history_path)] + list(projects)
+
+    print("Scanning project sizes...")
+    job_id = executor.submit("scan_project_sizes", command, log_path)
+    if job_id is None:
+        return False
+    state = executor.wait([job_id])[job_id]
+    print(f"  Scan {state.lower()}, log: {log_path}\n")
+    return state == "DONE"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Submit size-balanced sync jobs for HBS grid project spaces",
+                                     # Unknown options go to the sync jobs; none may be read as an abbreviation
+                                     allow_abbrev=False)
+    parser.add_argument("projects", nargs="*", help="Project names to sync (default: all)")
+    parser.add_argument("--jobs", type=int, default=DEFAULT_JOBS,
+                        help=f"Number of jobs to spread the total size over (default: {DEFAULT_JOBS})")
+    parser.add_argument("--min-shard-gb", type=float, default=DEFAULT_MIN_SHARD_GB,
+                        help=f"Do not split projects into shards smaller than this (default: {DEFAULT_MIN_SHARD_GB})")
+    parser.add_argument("--no-shard", action="store_true", help="Submit one job per project")
+    parser.add_argument("--history", default=str(DEFAULT_HISTORY_PATH),
+                        help=f"Scan history database with project sizes (default: {DEFAULT_HISTORY_PATH})")
+    parser.add_argument("--dry-run", action="store_true", help="Print the plan without submitting jobs")
+    parser.add_argument("--executor", choices=["auto"] + list(EXECUTORS), default="auto",
+                        help="Where to run jobs: bsub, local processes, or print the commands only "
+                             "(default: bsub if available, else local)")
+    parser.add_argument("--max-parallel", type=int, default=DEFAULT_LOCAL_PARALLEL,
+                        help=f"Jobs run at once by the local executor (default: {DEFAULT_LOCAL_PARALLEL})")
+    parser.add_argument("--remote", help="rclone remote path passed on to every sync job (see manifest_sync.py)")
+    parser.add_argument("--scan", action="store_true", help="Refresh project sizes with a scan job before planning")
+    parser.add_argument("--no-wait", action="store_true", help="Submit the jobs and exit without waiting for them")
+    parser.add_argument("--poll-interval", type=int, default=DEFAULT_POLL_INTERVAL,
+                        help=f"Seconds between job status checks (default: {DEFAULT_POLL_INTERVAL})")
+
+    # Anything else (e.g. --full) is passed on to every sync job
+    args, sync_args = parser.parse_known_args()
+    if args.remote:
+        sync_args += ["--remote", args.remote]
+
+    registered = load_projects(refresh=True)
+    unknown = [name for name in args.projects if name not in registered]
+    if unknown:
+        print(f"Error: Unknown project(s): {', '.join(unknown)}", file=sys.stderr)
+        print(f"Available projects: {', '.join(registered)}", file=sys.stderr)
+        sys.exit(1)
+    projects = {name: registered[name] for name in (args.projects or registered)}
+    if not projects:
+        print("Error: No project spaces found (see project_registry.py)", file=sys.stderr)
+        sys.exit(1)
+
+    executor = make_executor(args.executor, max_parallel=args.max_parallel, poll_interval=args.poll_interval)
+    print(f"Running jobs with the {executor.name} executor\n")
+    if args.no_wait and not executor.detached:
+        print(f"⚠️  --no-wait is ignored: {executor.name} jobs only run while this script does\n")
+        args.no_wait = False
+
+    if args.scan and not scan_sizes(executor, projects, args.history):
+        print("⚠️  Size scan failed; planning with the sizes recorded earlier\n")
+
+    plan = plan_syncs(projects, args.history, jobs=args.jobs,
+                      min_shard_bytes=args.min_shard_gb * 1024 ** 3, shard=not args.no_shard)
+    print(f"Sync plan: {len(plan)} jobs for {len(projects)} projects\n")
+    print_plan(plan)
+    unsized = [job["project"] for job in plan if not job["sized"]]
+    if unsized:
+        print(f"\n⚠️  No scan data for {', '.join(unsized)}; run check_project_sizes.sh to enable sharding")
+
+    if args.dry_run:
+        return
+
+    started_at = datetime.now()
+    run_dir = SYNC_LOG_DIR / started_at.strftime("%Y%m%d-%H%M%S")
+    # A dry run only prints the commands, so leave no run behind for sync_report.py
+    record_run = executor.name != "dry-run"
+    if record_run:
+        run_dir.mkdir(parents=True, exist_ok=True)
+    run = {"started_at": started_at.isoformat(), "jobs": []}
+
+    print("\nSubmitting sync jobs...")
+    for job in plan:
+        log_path = run_dir / f"{job['name']}.log"
+        job_id = executor.submit(f"sync_{job['name']}", job_command(job, sync_args), log_path)
+        run["jobs"].append({
+            "name": job["name"], "project": job["project"], "parts": job["parts"], "planned_bytes": job["bytes"],
+            "job_id": job_id, "log": str(log_path), "status": None if job_id else "NOT_SUBMITTED",
+        })
+    if not record_run:
+        return
+    save_run(run_dir, run)
+    job_ids = [job["job_id"] for job in run["jobs"] if job["job_id"]]
+
+    print("")
+    print(f"{len(job_ids)} of {len(plan)} sync jobs submitted!")
+    print(f"Job IDs: {' '.join(job_ids)}")
+    print(f"Logs: {run_dir}")
+
+    if args.no_wait:
+        print("")
+        print("Monitor job status with:")
+        print(f"  bjobs {' '.join(job_ids)}")
+        print("")
+        print("Report on the run once the jobs are done with:")
+        print(f"  python3 {os.path.join(SCRIPT_DIR, 'sync_report.py')} {run_dir}")
+        if len(job_ids) < len(plan):
+            sys.exit(1)
+        return
+
+    print("\nWaiting for sync jobs to finish...")
+    states = executor.wait(job_ids) if job_ids else {}
+    for job in run["jobs"]:
+        if job["job_id"]:
+            job["status"] = states[job["job_id"]]
+    save_run(run_dir, run)
+
+    print("")
+    results = job_results(run)
+    print_report(run, results)
+    if any(result["status"] != "DONE" for result in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Bandwidth and concurrency policy for project space syncs.
+
+The policy is a JSON file (~/.hbsgrid/sync_policy.json, or HBSGRID_SYNC_POLICY)
+with a default schedule and optional per-project schedules. A schedule is a
+list of change points, each in effect from its start time until the next one,
+the same way rclone's --bwlimit timetable works:
+
+    {
+      "default": [
+        {"days": "Mon-Fri", "start": "08:00", "bwlimit": "20M", "transfers": 4, "checkers": 8},
+        {"days": "Mon-Fri", "start": "18:00", "bwlimit": "off"},
+        {"days": "Sat", "start": "00:00", "bwlimit": "off"}
+      ],
+      "projects": {
+        "mmiller_peps": [
+          {"days": "Mon-Fri", "start": "08:00", "bwlimit": "5M", "transfers": 2, "checkers": 4},
+          {"days": "Mon-Fri", "start": "20:00", "bwlimit": "50M"}
+        ]
+      }
+    }
+
+days is a day, a range ("Mon-Fri") or a comma-separated list, and defaults to
+every day. bwlimit takes rclone's bandwidth syntax ("20M", "10M:1M", "off").
+
+The bwlimit schedule becomes an rclone --bwlimit timetable, so rclone itself
+changes speed as windows start and end. transfers and checkers cannot change
+while rclone runs, so they cap the values a sync uses according to the window
+in effect when each rclone run starts. A project synced as several shards at
+once gives each shard an equal share of its bandwidth.
+
+Usage:
+    python3 sync_policy.py                 # Show each project's schedule and what applies now
+    python3 sync_policy.py --example       # Print an example policy file
+"""
+import os
+import re
+import sys
+import json
+import argparse
+from datetime import datetime
+from pathlib import Path
+
+from size_index import STATE_DIR
+
+DEFAULT_POLICY_PATH = Path(os.environ.get("HBSGRID_SYNC_POLICY", STATE_DIR / "sync_policy.json"))
+
+DAYS = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
+# rclone bandwidth suffixes; a bare number is KiB/s
+BANDWIDTH_UNITS = {"B": 1, "K": 1024, "M": 1024 ** 2, "G": 1024 ** 3, "T": 1024 ** 4}
+
+EXAMPLE_POLICY = {
+    "default": [
+        {"days": "Mon-Fri", "start": "08:00", "bwlimit": "20M", "transfers": 4, "checkers": 8},
+        {"days": "Mon-Fri", "start": "18:00", "bwlimit": "off"},
+        {"days": "Sat", "start": "00:00", "bwlimit": "off"},
+    ],
+    "projects": {
+        "mmiller_peps": [
+            {"days": "Mon-Fri", "start": "08:00", "bwlimit": "5M", "transfers": 2, "checkers": 4},
+            {"days": "Mon-Fri", "start": "20:00", "bwlimit": "50M"},
+        ],
+    },
+}
+
+
+def load_policy(path=DEFAULT_POLICY_PATH):
+    """The policy dict, or None when there is no policy file"""
+    path = Path(path)
+    if not path.exists():
+        return None
+    return json.loads(path.read_text())
+
+
+def project_schedule(policy, project):
+    if not policy:
+        return []
+    return policy.get("projects", {}).get(project, policy.get("default", []))
+
+
+def parse_days(days):
+    """Day indexes (Mon = 0) for 'Mon-Fri', 'Sat,Sun', 'Wed' or None (every day)"""
+    if not days:
+        return list(range(7))
+    indexes = []
+    for part in days.split(","):
+        first, _, last = part.strip().partition("-")
+        start = DAYS.index(first.strip()[:3].title())
+        end = DAYS.index(last.strip()[:3].title()) if last else start
+        indexes.extend((start + offset) % 7 for offset in range((end - start) % 7 + 1))
+    return sorted(set(indexes))
+
+
+def change_points(schedule):
+    """(day index, "HH:MM", entry) for every day each schedule entry applies to, in week order"""
+    points = []
+    for entry in schedule:
+        hours, minutes = (int(value) for value in entry["start"].split(":"))
+        for day in parse_days(entry.get("days")):
+            points.append((day, f"{hours:02d}:{minutes:02d}", entry))
+    return sorted(points, key=lambda point: point[:2])
+
+
+def active_entry(schedule, now=None):
+    """The schedule entry in effect at now, wrapping around from the end of the week"""
+    points = change_points(schedule)
+    if not points:
+        return None
+    now = now or datetime.now()
+    current = (now.weekday(), now.strftime("%H:%M"))
+    active = points[-1]
+    for point in points:
+        if point[:2] <= current:
+            active = point
+    return active[2]
+
+
+def scale_bandwidth(limit, share):
+    """Divide an rclone bandwidth value such as '20M' or '10M:1M' by share"""
+    if share <= 1 or limit == "off":
+        return limit
+    scaled = []
+    for value in limit.split(":"):
+        match = re.fullmatch(r"([\d.]+)([BKMGT]?)", value.strip(), re.IGNORECASE)
+        if not match:
+            return limit
+        size = float(match.group(1)) * BANDWIDTH_UNITS[(match.group(2) or "K").upper()]
+        scaled.append(f"{max(int(size / share / 1024), 1)}K")
+    return ":".join(scaled)
+
+
+def bwlimit_timetable(schedule, share=1):
+    """rclone --bwlimit value for the schedule, or None when nothing is ever limited.
+
+    Entries without a bwlimit are unlimited.
+    """
+    points = change_points(schedule)
+    if all(entry.get("bwlimit", "off") == "off" for _, _, entry in points):
+        return None
+    return " ".join(
+        f"{DAYS[day]}-{time},{scale_bandwidth(entry.get('bwlimit', 'off'), share)}" for day, time, entry in points
+    )
+
+
+def option_value(args, name):
+    """Value of an rclone option given as '--name value' or '--name=value', or None"""
+    for index, arg in enumerate(args):
+        if arg == name and index + 1 < len(args):
+            return args[index + 1]
+        if arg.startswith(name + "="):
+            return arg.split("=", 1)[1]
+    return None
+
+
+def apply_policy(project, rclone_args, share=1, policy=None, now=None):
+    """rclone arguments with the project's policy applied.
+
+    Adds the --bwlimit timetable unless one was given, and caps --transfers and
+    --checkers at the values of the window in effect now.
+    """
+    schedule = project_schedule(policy, project)
+    args = list(rclone_args)
+    if not schedule:
+        return args
+
+    timetable = bwlimit_timetable(schedule, share)
+    if timetable and option_value(args, "--bwlimit") is None:
+        args += ["--bwlimit", timetable]
+
+    entry = active_entry(schedule, now)
+    for option in ("transfers", "checkers"):
+        if option not in entry:
+            continue
+        given = option_value(args, f"--{option}")
+        if given is None or int(given) > entry[option]:
+            # rclone uses the last occurrence of an option
+            args += [f"--{option}", str(entry[option])]
+    return args
+
+
+def describe_entry(entry):
+    if entry is None:
+        return "no limits"
+    parts = [f"bwlimit {entry.get('bwlimit', 'off')}"]
+    parts += [f"{option} ≤ {entry[option]}" for option in ("transfers", "checkers") if option in entry]
+    return ", ".join(parts)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Show the sync bandwidth and concurrency policy")
+    parser.add_argument("--policy", default=str(DEFAULT_POLICY_PATH),
+                        help=f"Policy file (default: {DEFAULT_POLICY_PATH})")
+    parser.add_argument("--example", action="store_true", help="Print an example policy file and exit")
+
+    args = parser.parse_args()
+
+    if args.example:
+        print(json.dumps(EXAMPLE_POLICY, indent=2))
+        return
+
+    policy = load_policy(args.policy)
+    if policy is None:
+        print(f"No sync policy at {args.policy}; syncs run without bandwidth limits.")
+        print(f"Create one with: python3 {sys.argv[0]} --example > {args.policy}")
+        return
+
+    schedules = {"(default)": policy.get("default", [])}
+    schedules.update(policy.get("projects", {}))
+    for name, schedule in schedules.items():
+        print(f"\n{name}")
+        print(f"  Now: {describe_entry(active_entry(schedule))}")
+        print(f"  --bwlimit: {bwlimit_timetable(schedule) or 'none'}")
+
+
+if __name__ == "__main__":
+    main()
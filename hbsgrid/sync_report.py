@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Completion report for a sync run submitted by sync_orchestrator.py.
+
+Each run gets a directory under ~/.hbsgrid/sync_logs/ holding run.json (the
+jobs, their IDs and final status) and one log per job. This script parses the
+rclone stats blocks and errors in those logs and reports bytes transferred,
+throughput, rclone time, errors and retried files per project and per job, so
+slow or failing syncs stand out.
+
+Usage:
+    python3 sync_report.py                 # Report on the latest run
+    python3 sync_report.py RUN_DIR         # Report on a given run
+    python3 sync_report.py --list          # List recorded runs
+"""
+import re
+import sys
+import json
+import argparse
+from pathlib import Path
+
+from size_index import STATE_DIR
+from size_growth_report import human_readable
+
+SYNC_LOG_DIR = STATE_DIR / "sync_logs"
+RUN_FILE_NAME = "run.json"
+
+# Lines of rclone's multi-line stats block (--stats-log-level NOTICE)
+# "Transferred:" appears twice: bytes (with a unit) first, then file counts
+BYTES_LINE = re.compile(r"^Transferred:\s+([\d.]+\s*[A-Za-z]+)\s*/")
+FILES_LINE = re.compile(r"^Transferred:\s+(\d+)\s*/\s*(\d+),")
+CHECKS_LINE = re.compile(r"^Checks:\s+(\d+)")
+DELETED_LINE = re.compile(r"^Deleted:\s+(\d+)")
+ERRORS_LINE = re.compile(r"^Errors:\s+(\d+)")
+ELAPSED_LINE = re.compile(r"^Elapsed time:\s+(\S+)")
+ATTEMPT_LINE = re.compile(r"Attempt (\d+)/(\d+) failed with (\d+) errors")
+ERROR_LINE = re.compile(r"ERROR\s*:\s*(.+?):\s")
+# manifest_sync.py prints the command before each rclone invocation
+COMMAND_LINE = re.compile(r"^\$ rclone ")
+
+SIZE_UNITS = {"": 1, "K": 1024, "M": 1024 ** 2, "G": 1024 ** 3, "T": 1024 ** 4, "P": 1024 ** 5}
+DURATION_UNITS = {"ms": 0.001, "s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+def parse_size(text):
+    """Bytes from an rclone size such as '1.234 GiB', '512 B' or '1.2G'"""
+    match = re.match(r"([\d.]+)\s*([A-Za-z]*)", text.strip())
+    unit = match.group(2).upper().replace("BYTES", "").replace("IB", "").replace("B", "")
+    return int(float(match.group(1)) * SIZE_UNITS.get(unit, 1))
+
+
+def parse_duration(text):
+    """Seconds from an rclone duration such as '1h2m3.4s'"""
+    return sum(float(number) * DURATION_UNITS[unit] for number, unit in re.findall(r"([\d.]+)(ms|[dhms])", text))
+
+
+def empty_stats():
+    return {"bytes": 0, "files": 0, "checks": 0, "deleted": 0, "errors": 0, "seconds": 0.0}
+
+
+def parse_rclone_log(path):
+    """Totals over every rclone invocation in one job log.
+
+    The last stats block of each invocation holds its final totals. Also returns
+    failed attempts, the files named in ERROR lines and whether the sync finished.
+    """
+    totals = empty_stats()
+    current = None
+    attempts_failed = 0
+    error_files = set()
+    finished = None
+
+    def commit():
+        if current is not None:
+            for key, value in current.items():
+                totals[key] += value
+
+    for line in Path(path).read_text(errors="replace").splitlines():
+        # rclone prefixes log lines with a timestamp; stats block lines are bare
+        stripped = line.strip()
+        if COMMAND_LINE.match(stripped):
+            commit()
+            current = None
+            continue
+        match = BYTES_LINE.match(stripped)
+        if match:
+            # Start of a new stats block; it supersedes the previous one of this invocation
+            current = empty_stats()
+            current["bytes"] = parse_size(match.group(1))
+            continue
+        if current is not None:
+            for pattern, key, convert in (
+                (FILES_LINE, "files", int), (CHECKS_LINE, "checks", int), (DELETED_LINE, "deleted", int),
+                (ERRORS_LINE, "errors", int), (ELAPSED_LINE, "seconds", parse_duration)
+            ):
+                match = pattern.match(stripped)
+                if match:
+                    current[key] = convert(match.group(1))
+                    break
+        if ATTEMPT_LINE.search(stripped):
+            attempts_failed += 1
+        match = ERROR_LINE.search(stripped)
+        if match and "Attempt" not in stripped:
+            error_files.add(match.group(1))
+        if stripped.startswith("✅ Sync of"):
+            finished = True
+        elif stripped.startswith("❌"):
+            finished = False
+    commit()
+
+    totals.update({
+        "attempts_failed": attempts_failed,
+        "error_files": sorted(error_files),
+        "finished": finished,
+    })
+    return totals
+
+
+def run_dirs():
+    return sorted(p.parent for p in SYNC_LOG_DIR.glob(f"*/{RUN_FILE_NAME}"))
+
+
+def load_run(run_dir):
+    return json.loads((Path(run_dir) / RUN_FILE_NAME).read_text())
+
+
+def save_run(run_dir, run):
+    (Path(run_dir) / RUN_FILE_NAME).write_text(json.dumps(run, indent=2))
+
+
+def job_results(run):
+    """Parsed log stats for every job in a run, with its status"""
+    results = []
+    for job in run["jobs"]:
+        log = Path(job["log"]) if job.get("log") else None
+        stats = parse_rclone_log(log) if log and log.exists() else dict(
+            empty_stats(), attempts_failed=0, error_files=[], finished=None
+        )
+        status = job.get("status") or "UNKNOWN"
+        if status in ("UNKNOWN", "NOT_FOUND") and stats["finished"] is not None:
+            # Aged out of bjobs; the log says how it ended
+            status = "DONE" if stats["finished"] else "EXIT"
+        results.append(dict(stats, name=job["name"], project=job["project"], status=status,
+                            job_id=job.get("job_id"), log=job.get("log")))
+    return results
+
+
+def throughput(stats):
+    """Average bytes per second of rclone time"""
+    return stats["bytes"] / stats["seconds"] if stats["seconds"] else 0
+
+
+def format_seconds(seconds):
+    hours, rest = divmod(int(seconds), 3600)
+    minutes, secs = divmod(rest, 60)
+    return f"{hours}h{minutes:02d}m{secs:02d}s" if hours else f"{minutes}m{secs:02d}s"
+
+
+def print_report(run, results):
+    print("## Sync Run Report\n")
+    print(f"**Started:** {run['started_at'][:19].replace('T', ' ')}")
+    print(f"**Jobs:** {len(results)} ({sum(r['status'] == 'DONE' for r in results)} done, "
+          f"{sum(r['status'] == 'EXIT' for r in results)} failed)\n")
+
+    projects = {}
+    for result in results:
+        project = projects.setdefault(result["project"], dict(
+            empty_stats(), jobs=0, failed_jobs=0, attempts_failed=0, error_files=0, longest=0.0
+        ))
+        project["jobs"] += 1
+        project["failed_jobs"] += result["status"] != "DONE"
+        project["attempts_failed"] += result["attempts_failed"]
+        project["error_files"] += len(result["error_files"])
+        project["longest"] = max(project["longest"], result["seconds"])
+        for key in empty_stats():
+            project[key] += result[key]
+
+    print("### Per Project\n")
+    print("| Project | Jobs | Failed | Transferred | Files | Checks | Deleted | Longest Job | Throughput "
+          "| Errors | Retries | Error Files |")
+    print("|---------|------|--------|-------------|-------|--------|---------|-------------|------------"
+          "|--------|---------|-------------|")
+    for name, project in sorted(projects.items(), key=lambda item: item[1]["longest"], reverse=True):
+        print(f"| {name} | {project['jobs']} | {project['failed_jobs']} | {human_readable(project['bytes'])} | "
+              f"{project['files']:,} | {project['checks']:,} | {project['deleted']:,} | "
+              f"{format_seconds(project['longest'])} | {human_readable(throughput(project))}/s | "
+              f"{project['errors']} | {project['attempts_failed']} | {project['error_files']} |")
+
+    print("\n### Per Job\n")
+    print("| Job | ID | Status | Transferred | Files | rclone Time | Throughput | Errors | Retries |")
+    print("|-----|----|--------|-------------|-------|-------------|------------|--------|---------|")
+    for result in sorted(results, key=lambda r: r["seconds"], reverse=True):
+        flag = "" if result["status"] == "DONE" else " ❌"
+        print(f"| {result['name']} | {result['job_id'] or '-'} | {result['status']}{flag} | "
+              f"{human_readable(result['bytes'])} | {result['files']:,} | {format_seconds(result['seconds'])} | "
+              f"{human_readable(throughput(result))}/s | {result['errors']} | {result['attempts_failed']} |")
+
+    failing = [r for r in results if r["error_files"] or r["status"] != "DONE"]
+    if failing:
+        print("\n### Problems\n")
+        for result in failing:
+            print(f"- **{result['name']}** ({result['status']}), log: {result['log']}")
+            for path in result["error_files"][:10]:
+                print(f"  - {path}")
+            if len(result["error_files"]) > 10:
+                print(f"  - ... and {len(result['error_files']) - 10} more")
+
+    total = sum(r["bytes"] for r in results)
+    print(f"\n**Total transferred:** {human_readable(total)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report on a grid sync run from its job logs")
+    parser.add_argument("run_dir", nargs="?", help="Run directory (default: the latest run)")
+    parser.add_argument("--list", action="store_true", help="List recorded runs and exit")
+
+    args = parser.parse_args()
+
+    runs = run_dirs()
+    if args.list:
+        for run_dir in runs:
+            run = load_run(run_dir)
+            print(f"{run_dir}  {len(run['jobs'])} jobs")
+        return
+
+    if args.run_dir is None and not runs:
+        print(f"Error: No sync runs found in {SYNC_LOG_DIR}", file=sys.stderr)
+        print("Please run sync_all_project_spaces.sh first", file=sys.stderr)
+        sys.exit(1)
+    run_dir = Path(args.run_dir) if args.run_dir else runs[-1]
+
+    run = load_run(run_dir)
+    print_report(run, job_results(run))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,60 +1,35 @@
 #!/bin/bash
 
 # Single project sync script for HBS grid to Dropbox
-# Usage: ./sync_single_project.sh <project_name>
+# Usage: ./sync_single_project.sh <project_name> [--full] [--dry-run] [extra rclone flags]
+#
+# The sync is done by manifest_sync.py, which compares the project space with a
+# manifest of the last successful sync and only hands changed files to rclone,
+# running a full rclone sync weekly (or with --full).
 
-if [ $# -ne 1 ]; then
+SCRIPT_DIR="$( cd "$( dirname "${BASH_SOURCE[0]}" )" &> /dev/null && pwd )"
+REGISTRY="$SCRIPT_DIR/project_registry.py"
+
+if [ $# -lt 1 ]; then
     echo "Usage: $0 <project_name>"
     echo "Available projects:"
-    echo "  mmiller_commitee_votes"
-    echo "  mmiller_peps"
-    echo "  mmiller_colonialism"
-    echo "  mmiller_emrisk"
-    echo "  mmiller_bill_probability"
-    echo "  mmiller_foreign_influence"
-    echo "  mmiller_ownership_chains"
+    python3 "$REGISTRY" --names | sed 's/^/  /'
     exit 1
 fi
 
 PROJECT_NAME=$1
+shift
 
-# Load rclone module
-module load rclone
-
-echo "Starting sync of $PROJECT_NAME to Dropbox..."
+# Look up the project path in the shared project registry
+SOURCE_PATH=$(python3 "$REGISTRY" --path "$PROJECT_NAME") || exit 1
 
-# Define project paths and sync accordingly
-case $PROJECT_NAME in
-    "mmiller_commitee_votes")
-        SOURCE_PATH="/export/projects/mmiller_commitee_votes"
-        ;;
-    "mmiller_peps")
-        SOURCE_PATH="/export/projects4/mmiller_peps"
-        ;;
-    "mmiller_colonialism")
-        SOURCE_PATH="/export/projects4/mmiller_colonialism"
-        ;;
-    "mmiller_emrisk")
-        SOURCE_PATH="/export/projects4/mmiller_emrisk"
-        ;;
-    "mmiller_bill_probability")
-        SOURCE_PATH="/export/projects3/mmiller_bill_probability"
-        ;;
-    "mmiller_foreign_influence")
-        SOURCE_PATH="/export/projects4/mmiller_foreign_influence"
-        ;;
-    "mmiller_ownership_chains")
-        SOURCE_PATH="/export/projects4/mmiller_ownership_chains"
-        ;;
-    *)
-        echo "Error: Unknown project name '$PROJECT_NAME'"
-        echo "Available projects: mmiller_commitee_votes, mmiller_peps, mmiller_colonialism, mmiller_emrisk, mmiller_bill_probability, mmiller_foreign_influence, mmiller_ownership_chains"
-        exit 1
-        ;;
-esac
+# Load rclone module where environment modules are available
+if command -v module &> /dev/null; then
+    module load rclone
+fi
 
-echo "Syncing $PROJECT_NAME from $SOURCE_PATH..."
-rclone sync "$SOURCE_PATH" "dropbox:hbsgrid/$PROJECT_NAME" --progress
+echo "Starting sync of $PROJECT_NAME to Dropbox..."
+python3 "$SCRIPT_DIR/manifest_sync.py" "$PROJECT_NAME" --source "$SOURCE_PATH" "$@"
 
 if [ $? -eq 0 ]; then
     echo "Successfully synced $PROJECT_NAME to Dropbox!"
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""Tests for job_executors.py: python3 -m unittest test_job_executors"""
+import shlex
+import subprocess
+import unittest
+from unittest import mock
+
+from job_executors import BsubExecutor
+
+
+class BsubExecutorTest(unittest.TestCase):
+    def test_command_is_one_shell_quoted_argument(self):
+        command = ["bash", "sync_single_project.sh", "--part", "Finance and Development/data"]
+        submitted = subprocess.CompletedProcess([], 0, stdout="Job <12345> is submitted to queue <normal>.\n",
+                                                stderr="")
+        with mock.patch("job_executors.subprocess.run", return_value=submitted) as run:
+            job_id = BsubExecutor().submit("sync_part 1", command, "/tmp/logs/sync part 1.log")
+
+        self.assertEqual(job_id, "12345")
+        self.assertEqual(run.call_args.args[0], [
+            "bsub", "-J", "sync_part 1", "-o", "/tmp/logs/sync part 1.log",
+            "bash sync_single_project.sh --part 'Finance and Development/data'",
+        ])
+        # The shell LSF runs it with gets the original arguments back
+        self.assertEqual(shlex.split(run.call_args.args[0][-1]), command)
+
+    def test_failed_bjobs_call_keeps_jobs_running(self):
+        failed = subprocess.CompletedProcess([], 255, stdout="", stderr="LSF is down. Please wait ...\n")
+        done = subprocess.CompletedProcess([], 0, stdout="101 DONE\n102 EXIT\n", stderr="")
+        executor = BsubExecutor(poll_interval=0)
+        with mock.patch("job_executors.subprocess.run", side_effect=[failed, done]) as run, \
+                mock.patch("job_executors.time.sleep"):
+            self.assertEqual(executor.status(["101", "102"], {"101": "RUN"}), {"101": "RUN", "102": "UNKNOWN"})
+            run.side_effect = [failed, done]
+            states = executor.wait(["101", "102"])
+
+        # The failed poll did not end the wait; the next one did
+        self.assertEqual(run.call_count, 3)
+        self.assertEqual(states, {"101": "DONE", "102": "EXIT"})
+
+    def test_only_jobs_reported_not_found_are_not_found(self):
+        result = subprocess.CompletedProcess([], 255, stdout="101 RUN\n", stderr="Job <102> is not found\n")
+        with mock.patch("job_executors.subprocess.run", return_value=result):
+            states = BsubExecutor().status(["101", "102", "103"])
+        self.assertEqual(states, {"101": "RUN", "102": "NOT_FOUND", "103": "UNKNOWN"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Rename files to lowercase with underscores instead of spaces.
+
+All renames are planned before any is made. A name that would collide with an
+existing file, or with another renamed file, gets a numeric suffix
+(report.pdf -> report_2.pdf). Renames whose target differs from an existing
+name only by case go through a temporary name, so case-only renames work on
+case-insensitive filesystems (macOS) too.
+
+Every rename made is written to an undo log as it happens, so a run, even an
+interrupted one, can be reversed with --undo. Undo never overwrites a file
+created at an original name since. Hidden files are left alone.
+
+Usage:
+    python3 rename_files.py                        # Files in the current directory
+    python3 rename_files.py DIR -r                 # Files in DIR and all its subdirectories
+    python3 rename_files.py DIR -r --dirs          # Directory names too
+    python3 rename_files.py --dry-run --manifest plan.tsv
+    python3 rename_files.py --undo .rename_undo_20250101-120000.tsv
+"""
+import os
+import re
+import sys
+import argparse
+from datetime import datetime
+from itertools import groupby
+
+UNDO_LOG_PREFIX = ".rename_undo_"
+TEMP_PREFIX = ".rename_tmp_"
+
+
+def normalize(name):
+    """Lowercase, with each run of whitespace replaced by one underscore"""
+    return re.sub(r"\s+", "_", name.lower())
+
+
+def unique_name(name, taken):
+    """name, or name with the first free numeric suffix; taken holds lowercased names"""
+    if name.lower() not in taken:
+        return name
+    stem, extension = os.path.splitext(name)
+    number = 2
+    while f"{stem}_{number}{extension}".lower() in taken:
+        number += 1
+    return f"{stem}_{number}{extension}"
+
+
+def plan_directory(directory, include_dirs):
+    """[(old path, new path, via_temp)] for the entries of one directory"""
+    try:
+        entries = sorted(os.scandir(directory), key=lambda entry: entry.name)
+    except OSError as e:
+        print(f"⚠️  Cannot read {directory}: {e}", file=sys.stderr)
+        return []
+
+    candidates = [entry for entry in entries if not entry.name.startswith(".")
+                  and (include_dirs or not entry.is_dir(follow_symlinks=False))]
+    renamed = [entry for entry in candidates if normalize(entry.name) != entry.name]
+    renamed_names = {entry.name for entry in renamed}
+
+    # Names that stay put, compared case-insensitively
+    staying = {entry.name.lower() for entry in entries if entry.name not in renamed_names}
+    # Any current name, since a target matching one of them only by case needs a temporary name
+    current = {entry.name.lower() for entry in entries}
+
+    plan = []
+    taken = set(staying)
+    for entry in renamed:
+        target = unique_name(normalize(entry.name), taken)
+        taken.add(target.lower())
+        plan.append((entry.path, os.path.join(directory, target), target.lower() in current))
+    return plan
+
+
+def plan_renames(root, recursive=False, include_dirs=False):
+    """Renames in the order they can be applied: deepest directories first"""
+    if not recursive:
+        return plan_directory(root, include_dirs)
+    directories = []
+    for directory, subdirs, _ in os.walk(root):
+        subdirs[:] = sorted(d for d in subdirs if not d.startswith("."))
+        directories.append(directory)
+    # Reversed, every directory comes after everything inside it
+    plan = []
+    for directory in reversed(directories):
+        plan.extend(plan_directory(directory, include_dirs))
+    return plan
+
+
+def apply_renames(plan, undo_log_path):
+    """Make the planned renames, logging each one; returns the number made"""
+    count = 0
+    with open(undo_log_path, "w") as log:
+        def rename(old, new):
+            os.rename(old, new)
+            log.write(f"{old}\t{new}\n")
+            log.flush()
+
+        # One directory at a time, before its own name changes
+        for directory, renames in groupby(plan, key=lambda item: os.path.dirname(item[0])):
+            # Renames that clash by case go to temporary names first
+            temps = []
+            for index, (old, new, via_temp) in enumerate(renames):
+                if via_temp:
+                    temp = os.path.join(directory, f"{TEMP_PREFIX}{index}_{os.path.basename(new)}")
+                    rename(old, temp)
+                    temps.append((temp, old, new))
+                else:
+                    rename(old, new)
+                    count += 1
+                    print(f"Renamed: '{old}' → '{new}'")
+            for temp, old, new in temps:
+                rename(temp, new)
+                count += 1
+                print(f"Renamed: '{old}' → '{new}'")
+    return count
+
+
+def undo(undo_log_path):
+    """Reverse the renames in an undo log, last first; returns (reversed, skipped) counts.
+
+    A rename whose original name has been taken since, or whose new name is
+    gone, is skipped and reported rather than overwriting anything.
+    """
+    with open(undo_log_path) as log:
+        hops = [line.rstrip("\n").split("\t") for line in log if line.strip()]
+    # A rename through a temporary name is logged as two hops, old → temp and temp → new
+    final_names = {old: new for old, new in hops if os.path.basename(old).startswith(TEMP_PREFIX)}
+    renames = [(old, final_names.get(new, new)) for old, new in hops
+               if not os.path.basename(old).startswith(TEMP_PREFIX)]
+
+    count = skipped = 0
+    for index, (old, new) in enumerate(reversed(renames)):
+        if not os.path.lexists(new):
+            print(f"⚠️  Skipped: '{new}' no longer exists, so '{old}' was not restored", file=sys.stderr)
+            skipped += 1
+            continue
+        if os.path.lexists(old):
+            if not os.path.samefile(old, new):
+                print(f"⚠️  Skipped: '{old}' exists, so '{new}' was not restored to it", file=sys.stderr)
+                skipped += 1
+                continue
+            # The names differ only by case on a case-insensitive filesystem
+            temp = os.path.join(os.path.dirname(new), f"{TEMP_PREFIX}{index}_{os.path.basename(old)}")
+            os.rename(new, temp)
+            os.rename(temp, old)
+        else:
+            os.rename(new, old)
+        print(f"Restored: '{new}' → '{old}'")
+        count += 1
+    return count, skipped
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rename files to lowercase with underscores instead of spaces")
+    parser.add_argument("directory", nargs="?", default=".", help="Directory to rename files in (default: .)")
+    parser.add_argument("-r", "--recursive", action="store_true", help="Include all subdirectories")
+    parser.add_argument("--dirs", action="store_true", help="Rename directories as well as files")
+    parser.add_argument("--dry-run", action="store_true", help="Show the planned renames without making them")
+    parser.add_argument("--manifest", help="Write the planned renames to this TSV file")
+    parser.add_argument("--undo-log", help=f"Undo log to write (default: DIRECTORY/{UNDO_LOG_PREFIX}<time>.tsv)")
+    parser.add_argument("--undo", metavar="LOG", help="Reverse the renames recorded in an undo log and exit")
+
+    args = parser.parse_args()
+
+    if args.undo:
+        count, skipped = undo(args.undo)
+        print(f"\n✅ Reversed {count} rename(s) from {args.undo}")
+        if skipped:
+            print(f"⚠️  {skipped} rename(s) skipped, see above", file=sys.stderr)
+            sys.exit(1)
+        return
+
+    if not os.path.isdir(args.directory):
+        print(f"Error: Directory not found: {args.directory}", file=sys.stderr)
+        sys.exit(1)
+
+    print(f"Renaming files in {args.directory}{' and its subdirectories' if args.recursive else ''}...")
+    print("Converting to lowercase and replacing spaces with underscores\n")
+
+    plan = plan_renames(args.directory, args.recursive, args.dirs)
+    adjusted = [(old, new) for old, new, _ in plan if os.path.basename(new) != normalize(os.path.basename(old))]
+
+    if args.manifest:
+        with open(args.manifest, "w") as manifest:
+            for old, new, _ in plan:
+                manifest.write(f"{old}\t{new}\n")
+        print(f"📝 Plan written to {args.manifest}")
+
+    if not plan:
+        print("No files needed renaming.")
+        return
+
+    if args.dry_run:
+        for old, new, _ in plan:
+            print(f"Would rename: '{old}' → '{new}'")
+        print(f"\n{len(plan)} file(s) would be renamed, {len(adjusted)} with a suffix to avoid a collision.")
+        return
+
+    undo_log_path = args.undo_log or os.path.join(
+        args.directory, f"{UNDO_LOG_PREFIX}{datetime.now():%Y%m%d-%H%M%S}.tsv"
+    )
+    try:
+        count = apply_renames(plan, undo_log_path)
+    except OSError as e:
+        print(f"\n❌ Rename failed: {e}", file=sys.stderr)
+        print(f"Renames made so far can be reversed with: {sys.argv[0]} --undo {undo_log_path}", file=sys.stderr)
+        sys.exit(1)
+
+    for old, new in adjusted:
+        print(f"⚠️  '{old}' became '{os.path.basename(new)}' to avoid a collision")
+    print(f"\n✅ Successfully renamed {count} {'entries' if args.dirs else 'file(s)'}.")
+    print(f"Undo with: {sys.argv[0]} --undo {undo_log_path}")
+
+
+if __name__ == "__main__":
+    main()
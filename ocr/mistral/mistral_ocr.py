@@ -1,16 +1,57 @@
+"""
+OCR PDFs with Mistral into markdown plus extracted images.
+
+Usable as a script (see readme.md) or as a library from other pipelines:
+
+    from mistral_ocr import get_client, ocr_pdf, process_pdf, read_page, render_pages, JsonlSink
+
+    client = get_client()
+    for pdf_path in pdf_paths:
+        process_pdf(pdf_path, sink=JsonlSink("ocr.jsonl"), client=client)
+
+    # Or consume pages directly without writing anything
+    for page_number, markdown, images in render_pages(ocr_pdf(pdf_path, client=client)):
+        ...
+
+    # Random access to one page of a finished zip via its page index
+    markdown = read_page("report_ocr.zip", 42)
+"""
 import os
 import sys
+import json
+import time
+import struct
 import base64
+import hashlib
+import posixpath
 import zipfile
-import tempfile
-import shutil
+import argparse
 from pathlib import Path
+import httpx
 from mistralai import Mistral
+from mistralai.models import OCRResponse, SDKError
 from dotenv import load_dotenv
+from ocr_metrics import (
+    OCRMetrics, mark_failed, new_batch_record, new_document_record, record_response, timed
+)
 
 # Load environment variables from .env file
 load_dotenv(Path(__file__).parent.parent.parent / '.env')
 
+OCR_MODEL = "mistral-ocr-latest"
+
+# Batch jobs can sit in the queue for hours, so signed URLs must outlive them
+BATCH_SIGNED_URL_EXPIRY_HOURS = 48
+BATCH_POLL_INTERVAL = 30
+BATCH_TERMINAL_STATUSES = {"SUCCESS", "FAILED", "TIMEOUT_EXCEEDED", "CANCELLED"}
+
+# Transient API failures (network errors, 429 and 5xx responses) are retried with backoff
+MAX_RETRIES = 3
+RETRY_BACKOFF_SECONDS = 2
+
+# Written alongside the markdown in zip and directory outputs
+PAGE_INDEX_NAME = "page_index.json"
+
 def data_uri_to_bytes(data_uri):
     """Convert base64 image string to bytes"""
     _, encoded = data_uri.split(",", 1)
@@ -24,95 +65,562 @@ def export_image(image, save_dir):
         file.write(parsed_image)
     return image_path
 
-def process_pdf_to_zip(pdf_path):
-    """Process a PDF file and create a zip file with markdown and images"""
-    # Initialize Mistral client
+def get_client():
+    """Create a Mistral client, honouring MISTRAL_SERVER_URL for the local stand-in server"""
     api_key = os.getenv('MISTRAL_API_KEY')
     if not api_key:
         raise ValueError("MISTRAL_API_KEY not found in environment variables")
-    
-    client = Mistral(api_key=api_key)
-    
-    # Get file information
+
+    server_url = os.getenv('MISTRAL_SERVER_URL')
+    if server_url:
+        return Mistral(api_key=api_key, server_url=server_url)
+    return Mistral(api_key=api_key)
+
+def validate_pdf(pdf_path):
+    """Return the PDF path as a Path, raising if it is not an existing PDF"""
     pdf_path = Path(pdf_path)
     if not pdf_path.exists() or not pdf_path.suffix.lower() == '.pdf':
         raise ValueError(f"Invalid PDF file: {pdf_path}")
-    
-    filename = pdf_path.name
-    basename = pdf_path.stem
-    output_zip = pdf_path.parent / f"{basename}_ocr.zip"
-    
-    print(f"📄 Processing: {filename}")
-    
-    # Create temporary directory for output
-    with tempfile.TemporaryDirectory() as temp_dir:
+    return pdf_path
+
+def reject_pdf(pdf_path, mode, error, metrics):
+    """Report a path that is not a PDF to process and log it as a failed document"""
+    print(f"⚠️  Skipping {pdf_path}: not an existing .pdf file")
+    record = new_document_record(pdf_path, mode)
+    mark_failed(record, error)
+    metrics.log(record)
+
+def is_retryable(error):
+    """Whether an API error is worth retrying"""
+    if isinstance(error, httpx.TransportError):
+        return True
+    return isinstance(error, SDKError) and (error.status_code == 429 or error.status_code >= 500)
+
+def call_with_retries(record, func):
+    """Call func(), retrying transient API failures and counting retries in the metrics record"""
+    for attempt in range(MAX_RETRIES + 1):
         try:
-            # Upload the PDF file
-            with open(pdf_path, "rb") as f:
-                uploaded_pdf = client.files.upload(
-                    file={"file_name": filename, "content": f},
-                    purpose="ocr"
+            return func()
+        except Exception as e:
+            if attempt == MAX_RETRIES or not is_retryable(e):
+                raise
+            record["retries"] += 1
+            print(f"🔁 Retrying after error: {e}")
+            time.sleep(RETRY_BACKOFF_SECONDS ** attempt)
+
+def upload_pdf(client, pdf_path, expiry=24, record=None):
+    """Upload a PDF for OCR and return a signed URL the OCR endpoint can read"""
+    if record is None:
+        record = new_document_record(pdf_path, "sync")
+
+    def upload():
+        with open(pdf_path, "rb") as f:
+            return client.files.upload(
+                file={"file_name": pdf_path.name, "content": f},
+                purpose="ocr"
+            )
+
+    with timed(record, "upload"):
+        uploaded_pdf = call_with_retries(record, upload)
+        return call_with_retries(
+            record, lambda: client.files.get_signed_url(file_id=uploaded_pdf.id, expiry=expiry)
+        )
+
+def image_file_name(image_bytes):
+    """Content-addressed file name, so repeated logos and stamps share one copy"""
+    return f"img-{hashlib.sha256(image_bytes).hexdigest()[:16]}.jpeg"
+
+def render_pages(ocr_response, image_dir=""):
+    """Yield (page_number, markdown, images) for each OCR page.
+
+    Images are named by a hash of their decoded bytes, and image references in the
+    markdown are rewritten to image_dir/<name>. images is a list of unique
+    (file_name, image_bytes) pairs for the page; the same name recurs on every page
+    (and in every document) that contains the same image, so sinks write each name once.
+    """
+    for page in ocr_response.pages:
+        # Process markdown content to update image references
+        markdown_content = page.markdown
+        images = {}
+
+        for image in page.images:
+            image_bytes = data_uri_to_bytes(image.image_base64)
+            image_name = image_file_name(image_bytes)
+            images[image_name] = image_bytes
+            image_ref = posixpath.join(image_dir, image_name)
+            # Update image reference in markdown to use relative path
+            if f"![{image.id}]({image.id})" in markdown_content:
+                markdown_content = markdown_content.replace(
+                    f"![{image.id}]({image.id})",
+                    f"![{image.id}]({image_ref})"
+                )
+            else:
+                markdown_content = markdown_content.replace(
+                    f"![{image.id}]",
+                    f"![{image.id}]({image_ref})"
                 )
-            
-            # Get signed URL for the uploaded file
-            signed_url = client.files.get_signed_url(file_id=uploaded_pdf.id)
-            
-            # Perform OCR using Mistral
-            print("🔍 Performing OCR...")
-            ocr_response = client.ocr.process(
-                model="mistral-ocr-latest",
-                document={"type": "document_url", "document_url": signed_url.url},
-                include_image_base64=True
+
+        yield page.index + 1, markdown_content, list(images.items())
+
+def render_markdown_page(page_number, markdown_content):
+    """Format one page the way it appears in the combined markdown file"""
+    return f"# Page {page_number}\n\n{markdown_content}\n\n---\n\n"
+
+
+class PageIndex:
+    """Byte offsets of each page in the combined markdown file, plus an image-to-page map.
+
+    Pages must be added in the order they are written to the markdown file.
+    """
+
+    def __init__(self, markdown_name):
+        self.markdown_name = markdown_name
+        self.pages = []
+        self.images = {}
+        self.offset = 0
+
+    def add_page(self, page_number, page_text, markdown_content, image_names):
+        length = len(page_text.encode("utf-8"))
+        self.pages.append({
+            "page": page_number,
+            "offset": self.offset,
+            "length": length,
+            "text_length": len(markdown_content),
+            "images": image_names
+        })
+        for image_name in image_names:
+            self.images.setdefault(image_name, []).append(page_number)
+        self.offset += length
+
+    def to_json(self):
+        return json.dumps({
+            "markdown": self.markdown_name,
+            "page_count": len(self.pages),
+            "pages": self.pages,
+            "images": self.images
+        }, indent=1)
+
+
+class ZipSink:
+    """Write each document to <name>_ocr.zip containing the markdown file and images"""
+
+    def __init__(self, output_dir=None):
+        # By default archives are written next to the source PDF
+        self.output_dir = Path(output_dir) if output_dir else None
+
+    def write(self, pdf_path, ocr_response):
+        output_dir = self.output_dir or pdf_path.parent
+        output_zip = output_dir / f"{pdf_path.stem}_ocr.zip"
+        md_name = f"{pdf_path.stem}.md"
+        page_index = PageIndex(md_name)
+        markdown_pages = []
+        written_images = set()
+        image_count = 0
+
+        # Create zip file
+        print(f"📦 Creating zip file: {output_zip.name}")
+        with zipfile.ZipFile(output_zip, 'w', zipfile.ZIP_DEFLATED) as zipf:
+            # Add each unique image the first time a page references it
+            for page_number, markdown_content, images in render_pages(ocr_response):
+                page_text = render_markdown_page(page_number, markdown_content)
+                markdown_pages.append(page_text)
+                page_index.add_page(page_number, page_text, markdown_content, [name for name, _ in images])
+                for image_name, image_bytes in images:
+                    image_count += 1
+                    if image_name not in written_images:
+                        zipf.writestr(image_name, image_bytes)
+                        written_images.add(image_name)
+            # Store the markdown uncompressed so read_page() can seek straight to a page
+            zipf.writestr(md_name, "".join(markdown_pages), compress_type=zipfile.ZIP_STORED)
+            zipf.writestr(PAGE_INDEX_NAME, page_index.to_json())
+
+        print(f"✅ Success! Output saved to: {output_zip}")
+        print(f"   - Contains {len(written_images)} unique images ({image_count} references) and 1 markdown file")
+        return output_zip
+
+
+class DirectorySink:
+    """Write each document to a <name>_ocr_output/ directory of markdown and loose images.
+
+    With shared_images_dir, images from every document go into that one directory
+    instead, stored once per unique image and referenced by relative path.
+    """
+
+    def __init__(self, output_dir=None, shared_images_dir=None):
+        # By default the directory is created next to the source PDF
+        self.output_dir = Path(output_dir) if output_dir else None
+        self.shared_images_dir = Path(shared_images_dir) if shared_images_dir else None
+
+    def write(self, pdf_path, ocr_response):
+        output_dir = (self.output_dir or pdf_path.parent) / f"{pdf_path.stem}_ocr_output"
+        output_dir.mkdir(parents=True, exist_ok=True)
+
+        images_dir = self.shared_images_dir or output_dir
+        images_dir.mkdir(parents=True, exist_ok=True)
+        image_ref_dir = Path(os.path.relpath(images_dir, output_dir)).as_posix()
+        if image_ref_dir == ".":
+            image_ref_dir = ""
+
+        md_path = output_dir / f"{pdf_path.stem}.md"
+        page_index = PageIndex(md_path.name)
+        new_images = 0
+        with open(md_path, "w", encoding="utf-8", newline="") as f_out:
+            for page_number, markdown_content, images in render_pages(ocr_response, image_ref_dir):
+                page_text = render_markdown_page(page_number, markdown_content)
+                f_out.write(page_text)
+                page_index.add_page(page_number, page_text, markdown_content, [name for name, _ in images])
+                for image_name, image_bytes in images:
+                    # Names are content hashes, so an existing file already holds these bytes
+                    image_path = images_dir / image_name
+                    if not image_path.exists():
+                        image_path.write_bytes(image_bytes)
+                        new_images += 1
+        (output_dir / PAGE_INDEX_NAME).write_text(page_index.to_json(), encoding="utf-8")
+
+        print(f"✅ Markdown saved to: {md_path}")
+        print(f"🖼️ Images saved to: {images_dir} ({new_images} new)")
+        return output_dir
+
+
+class JsonlSink:
+    """Append one JSON record per page to a single JSONL file shared by all documents.
+
+    Records hold the document name, page number, markdown and image names; pass
+    include_images=True to embed the images as base64 as well. Each unique image is
+    embedded only in the first record that uses it within this sink.
+    """
+
+    def __init__(self, output_path, include_images=False):
+        self.output_path = Path(output_path)
+        self.include_images = include_images
+        self.embedded_images = set()
+
+    def write(self, pdf_path, ocr_response):
+        with open(self.output_path, "a", encoding="utf-8") as f_out:
+            for page_number, markdown_content, images in render_pages(ocr_response):
+                record = {
+                    "document": pdf_path.name,
+                    "page": page_number,
+                    "markdown": markdown_content,
+                    "images": [image_name for image_name, _ in images]
+                }
+                if self.include_images:
+                    record["image_data"] = {
+                        image_name: base64.b64encode(image_bytes).decode("ascii")
+                        for image_name, image_bytes in images
+                        if image_name not in self.embedded_images
+                    }
+                    self.embedded_images.update(record["image_data"])
+                f_out.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+        print(f"✅ {pdf_path.name} appended to: {self.output_path}")
+        return self.output_path
+
+
+def load_page_index(output_path):
+    """Load the page index from a zip or directory written by ZipSink/DirectorySink"""
+    output_path = Path(output_path)
+    if output_path.is_dir():
+        return json.loads((output_path / PAGE_INDEX_NAME).read_text(encoding="utf-8"))
+    with zipfile.ZipFile(output_path) as zipf:
+        return json.loads(zipf.read(PAGE_INDEX_NAME))
+
+def _stored_member_offset(zip_path, info):
+    """Absolute file offset of an uncompressed zip member's data"""
+    with open(zip_path, "rb") as f:
+        f.seek(info.header_offset)
+        local_header = f.read(30)
+    # The local header's name and extra field lengths can differ from the central directory's
+    name_length, extra_length = struct.unpack("<HH", local_header[26:30])
+    return info.header_offset + 30 + name_length + extra_length
+
+def read_page(output_path, page_number, page_index=None):
+    """Return the markdown for one page of a zip or directory output without reading the rest.
+
+    Pass a page_index from load_page_index() to avoid re-reading it for every page.
+    """
+    output_path = Path(output_path)
+    if page_index is None:
+        page_index = load_page_index(output_path)
+
+    entry = next((page for page in page_index["pages"] if page["page"] == page_number), None)
+    if entry is None:
+        raise ValueError(f"Page {page_number} not found in {output_path}")
+
+    if output_path.is_dir():
+        md_path, data_offset = output_path / page_index["markdown"], 0
+    else:
+        with zipfile.ZipFile(output_path) as zipf:
+            info = zipf.getinfo(page_index["markdown"])
+            # Archives from older runs compress the markdown, so decompress up to the page
+            if info.compress_type != zipfile.ZIP_STORED:
+                with zipf.open(info) as f:
+                    f.seek(entry["offset"])
+                    return f.read(entry["length"]).decode("utf-8")
+        md_path, data_offset = output_path, _stored_member_offset(output_path, info)
+
+    with open(md_path, "rb") as f:
+        f.seek(data_offset + entry["offset"])
+        return f.read(entry["length"]).decode("utf-8")
+
+OUTPUT_SINKS = {
+    "zip": ZipSink,
+    "dir": DirectorySink,
+    "jsonl": JsonlSink,
+}
+
+def ocr_pdf(pdf_path, client=None, record=None):
+    """Run OCR on a single PDF and return the Mistral OCRResponse"""
+    if client is None:
+        client = get_client()
+
+    pdf_path = validate_pdf(pdf_path)
+    if record is None:
+        record = new_document_record(pdf_path, "sync")
+
+    # Upload the PDF file and get a signed URL for it
+    signed_url = upload_pdf(client, pdf_path, record=record)
+
+    # Perform OCR using Mistral
+    print("🔍 Performing OCR...")
+    with timed(record, "ocr"):
+        ocr_response = call_with_retries(record, lambda: client.ocr.process(
+            model=OCR_MODEL,
+            document={"type": "document_url", "document_url": signed_url.url},
+            include_image_base64=True
+        ))
+    record_response(record, ocr_response)
+    return ocr_response
+
+def process_pdf(pdf_path, sink=None, client=None, metrics=None):
+    """Run OCR on a PDF and hand the result to an output sink (a ZipSink by default)"""
+    pdf_path = validate_pdf(pdf_path)
+    if sink is None:
+        sink = ZipSink()
+    if metrics is None:
+        metrics = OCRMetrics()
+    record = new_document_record(pdf_path, "sync")
+
+    print(f"📄 Processing: {pdf_path.name}")
+
+    try:
+        ocr_response = ocr_pdf(pdf_path, client=client, record=record)
+        with timed(record, "write"):
+            return sink.write(pdf_path, ocr_response)
+
+    except Exception as e:
+        mark_failed(record, e)
+        print(f"❌ Failed to process {pdf_path.name}")
+        print(f"Error: {e}")
+        raise
+
+    finally:
+        metrics.log(record)
+
+def process_pdf_to_zip(pdf_path, client=None):
+    """Process a PDF file and create a zip file with markdown and images"""
+    return process_pdf(pdf_path, sink=ZipSink(), client=client)
+
+def process_pdfs_batch(pdf_paths, sink=None, client=None, poll_interval=BATCH_POLL_INTERVAL, metrics=None):
+    """Submit many PDFs as one Mistral batch job and hand each result to an output sink.
+
+    Returns a dict mapping each PDF path to its output path, or None if that document failed.
+    """
+    if client is None:
+        client = get_client()
+    if sink is None:
+        sink = ZipSink()
+    if metrics is None:
+        metrics = OCRMetrics()
+
+    # Invalid paths are reported and left out of the batch, as failures
+    valid_paths = []
+    rejected = {}
+    for pdf_path in pdf_paths:
+        try:
+            valid_paths.append(validate_pdf(pdf_path))
+        except ValueError as e:
+            reject_pdf(pdf_path, "batch", e, metrics)
+            rejected[pdf_path] = None
+    pdf_paths = valid_paths
+    if not pdf_paths:
+        print("❌ No valid PDFs to submit")
+        return rejected
+
+    results = {pdf_path: None for pdf_path in pdf_paths}
+    records = {pdf_path: new_document_record(pdf_path, "batch") for pdf_path in pdf_paths}
+    batch_record = new_batch_record(len(pdf_paths))
+
+    # Upload every document and build one OCR request per document
+    print(f"📤 Uploading {len(pdf_paths)} PDFs for batch OCR...")
+    requests = []
+    for index, pdf_path in enumerate(pdf_paths):
+        signed_url = upload_pdf(client, pdf_path, expiry=BATCH_SIGNED_URL_EXPIRY_HOURS, record=records[pdf_path])
+        requests.append({
+            "custom_id": str(index),
+            "body": {
+                "document": {"type": "document_url", "document_url": signed_url.url},
+                "include_image_base64": True
+            }
+        })
+
+    batch_content = "".join(json.dumps(request) + "\n" for request in requests).encode("utf-8")
+    batch_record["request_file_bytes"] = len(batch_content)
+    with timed(batch_record, "submit"):
+        batch_file = call_with_retries(batch_record, lambda: client.files.upload(
+            file={"file_name": "ocr_batch.jsonl", "content": batch_content},
+            purpose="batch"
+        ))
+
+        job = call_with_retries(batch_record, lambda: client.batch.jobs.create(
+            input_files=[batch_file.id],
+            model=OCR_MODEL,
+            endpoint="/v1/ocr",
+            metadata={"job_type": "ocr"}
+        ))
+    batch_record["job_id"] = job.id
+    print(f"🧾 Submitted batch job {job.id} with {len(requests)} documents")
+
+    # Poll until the job reaches a terminal state
+    with timed(batch_record, "wait"):
+        while job.status not in BATCH_TERMINAL_STATUSES:
+            time.sleep(poll_interval)
+            job = call_with_retries(batch_record, lambda: client.batch.jobs.get(job_id=job.id))
+            print(f"⏳ Batch {job.id}: {job.status} "
+                  f"({job.completed_requests}/{job.total_requests} done, {job.failed_requests} failed)")
+    batch_record["status"] = job.status
+
+    if job.status != "SUCCESS":
+        print(f"❌ Batch job {job.id} finished with status {job.status}")
+
+    # Fan results out to the sink, one document at a time
+    if job.output_file:
+        with timed(batch_record, "download"):
+            output = call_with_retries(
+                batch_record, lambda: client.files.download(file_id=job.output_file).read()
             )
-            
-            # Create markdown file
-            md_path = Path(temp_dir) / f"{basename}.md"
-            image_paths = []
-            
-            with open(md_path, "w", encoding="utf-8") as f_out:
-                for page in ocr_response.pages:
-                    f_out.write(f"# Page {page.index + 1}\n\n")
-                    
-                    # Process markdown content to update image references
-                    markdown_content = page.markdown
-                    
-                    # Export images for this page
-                    for image in page.images:
-                        img_path = export_image(image, temp_dir)
-                        image_paths.append(img_path)
-                        # Update image reference in markdown to use relative path
-                        markdown_content = markdown_content.replace(
-                            f"![{image.id}]", 
-                            f"![{image.id}]({os.path.basename(img_path)})"
-                        )
-                    
-                    f_out.write(markdown_content)
-                    f_out.write("\n\n---\n\n")
-            
-            # Create zip file
-            print(f"📦 Creating zip file: {output_zip.name}")
-            with zipfile.ZipFile(output_zip, 'w', zipfile.ZIP_DEFLATED) as zipf:
-                # Add markdown file
-                zipf.write(md_path, arcname=md_path.name)
-                # Add all images
-                for img_path in image_paths:
-                    zipf.write(img_path, arcname=os.path.basename(img_path))
-            
-            print(f"✅ Success! Output saved to: {output_zip}")
-            print(f"   - Contains {len(image_paths)} images and 1 markdown file")
-            
-        except Exception as e:
-            print(f"❌ Failed to process {filename}")
-            print(f"Error: {e}")
-            raise
-
-def main():
-    if len(sys.argv) != 2:
-        print("Usage: python mistral_ocr.py <path_to_pdf>")
-        sys.exit(1)
-    
-    pdf_path = sys.argv[1]
-    process_pdf_to_zip(pdf_path)
+        batch_record["output_file_bytes"] = len(output)
+
+        for line in output.decode("utf-8").splitlines():
+            if not line.strip():
+                continue
+            result = json.loads(line)
+            pdf_path = pdf_paths[int(result["custom_id"])]
+            record = records[pdf_path]
+            response = result.get("response") or {}
+
+            if result.get("error") or response.get("status_code") != 200:
+                mark_failed(record, result.get("error") or response.get("body"))
+                print(f"❌ Failed to process {pdf_path.name}")
+                print(f"Error: {record['error']}")
+                continue
+
+            print(f"📄 Writing: {pdf_path.name}")
+            ocr_response = OCRResponse.model_validate(response["body"])
+            record_response(record, ocr_response, response_bytes=len(line.encode("utf-8")))
+            try:
+                with timed(record, "write"):
+                    results[pdf_path] = sink.write(pdf_path, ocr_response)
+            except Exception as e:
+                mark_failed(record, e)
+                print(f"❌ Failed to write {pdf_path.name}")
+                print(f"Error: {e}")
+
+    failed = [pdf_path for pdf_path, output_path in results.items() if output_path is None]
+    for pdf_path in failed:
+        if records[pdf_path]["status"] == "ok":
+            mark_failed(records[pdf_path], "No result in batch output")
+        print(f"❌ No OCR result for {pdf_path.name}")
+    print(f"✅ Batch complete: {len(results) - len(failed)} succeeded, {len(failed)} failed")
+
+    batch_record["succeeded"] = len(results) - len(failed)
+    batch_record["failed"] = len(failed)
+    for pdf_path in pdf_paths:
+        metrics.log(records[pdf_path])
+    metrics.log(batch_record)
+
+    return {**rejected, **results}
+
+def make_sink(output_format, output_path=None, shared_images_dir=None):
+    """Build an output sink from a CLI format name and optional output location"""
+    if output_format == "jsonl":
+        return JsonlSink(output_path or "ocr_output.jsonl")
+    if output_format == "dir":
+        return DirectorySink(output_path, shared_images_dir=shared_images_dir)
+    return OUTPUT_SINKS[output_format](output_path)
+
+def build_parser(default_format="zip"):
+    """Argument parser shared by the OCR command line scripts"""
+    parser = argparse.ArgumentParser(description="OCR PDF files with Mistral into markdown and images")
+    parser.add_argument("pdf_paths", nargs="+", help="PDF file(s) to process")
+    parser.add_argument(
+        "--output-format",
+        choices=sorted(OUTPUT_SINKS),
+        default=default_format,
+        help=f"zip: <name>_ocr.zip, dir: <name>_ocr_output/, jsonl: one record per page (default: {default_format})"
+    )
+    parser.add_argument(
+        "--output-path",
+        help="Directory for zip/dir output (default: next to each PDF), or file for jsonl (default: ocr_output.jsonl)"
+    )
+    parser.add_argument(
+        "--shared-images",
+        help="With dir output, store each unique image once in this directory across all documents"
+    )
+    parser.add_argument(
+        "--batch",
+        action="store_true",
+        help="Submit all PDFs as one batch job (slower to start, cheaper for large runs)"
+    )
+    parser.add_argument(
+        "--poll-interval",
+        type=int,
+        default=BATCH_POLL_INTERVAL,
+        help=f"Seconds between batch status checks (default: {BATCH_POLL_INTERVAL})"
+    )
+    parser.add_argument(
+        "--metrics-log",
+        help="Append per-document and per-batch metrics to this JSONL file"
+    )
+
+    return parser
+
+def main(default_format="zip"):
+    parser = build_parser(default_format)
+    args = parser.parse_args()
+    if args.shared_images and args.output_format != "dir":
+        parser.error("--shared-images requires --output-format dir")
+    sink = make_sink(args.output_format, args.output_path, args.shared_images)
+    metrics = OCRMetrics(args.metrics_log)
+
+    try:
+        if args.batch:
+            results = process_pdfs_batch(
+                args.pdf_paths, sink=sink, poll_interval=args.poll_interval, metrics=metrics
+            )
+            if any(output_path is None for output_path in results.values()):
+                sys.exit(1)
+        else:
+            client = get_client()
+            failed = []
+            for pdf_path in args.pdf_paths:
+                try:
+                    pdf_path = validate_pdf(pdf_path)
+                except ValueError as e:
+                    reject_pdf(pdf_path, "sync", e, metrics)
+                    failed.append(pdf_path)
+                    continue
+                try:
+                    process_pdf(pdf_path, sink=sink, client=client, metrics=metrics)
+                except Exception:
+                    # process_pdf has reported the error; carry on with the other files
+                    failed.append(pdf_path)
+            if failed:
+                print(f"❌ {len(failed)} of {len(args.pdf_paths)} files failed: "
+                      f"{', '.join(Path(pdf_path).name for pdf_path in failed)}")
+                sys.exit(1)
+    finally:
+        metrics.print_summary()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the subset of the Mistral API used by mistral_ocr.py.
+
+Implements file upload/signed URL/download, synchronous OCR and OCR batch jobs
+in memory so the OCR tools can be exercised without an API key or network access.
+The OCR output is synthetic: one page per PDF page object, each with a short
+markdown body and a single tiny image.
+
+Usage:
+    python mistral_standin_server.py --port 8765
+
+    MISTRAL_API_KEY=test MISTRAL_SERVER_URL=http://127.0.0.1:8765 \
+        python mistral_ocr.py --batch --poll-interval 1 a.pdf b.pdf
+"""
+
+import re
+import json
+import time
+import uuid
+import base64
+import argparse
+import threading
+from email.parser import BytesParser
+from email.policy import HTTP
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+# 1x1 white JPEG used for every synthetic image
+PLACEHOLDER_JPEG = base64.b64decode(
+    "/9j/4AAQSkZJRgABAQEASABIAAD/2wBDAP//////////////////////////////////////////////"
+    "////////////////////////////////////////////wgALCAABAAEBAREA/8QAFBABAAAAAAAAAAAA"
+    "AAAAAAAAAP/aAAgBAQABPxA="
+)
+PAGE_PATTERN = re.compile(rb"/Type\s*/Page(?!s)")
+
+
+def fake_ocr(filename, content, include_image_base64=True):
+    """Build a synthetic OCR response body for a PDF"""
+    page_count = max(1, len(PAGE_PATTERN.findall(content)))
+    image_b64 = "data:image/jpeg;base64," + base64.b64encode(PLACEHOLDER_JPEG).decode("ascii")
+
+    pages = []
+    for index in range(page_count):
+        image_id = f"img-{index}.jpeg"
+        pages.append({
+            "index": index,
+            "markdown": f"Stand-in OCR text for {filename}, page {index + 1}.\n\n![{image_id}]({image_id})",
+            "images": [{
+                "id": image_id,
+                "top_left_x": 0, "top_left_y": 0, "bottom_right_x": 1, "bottom_right_y": 1,
+                "image_base64": image_b64 if include_image_base64 else None
+            }],
+            "dimensions": {"dpi": 200, "height": 2200, "width": 1700}
+        })
+
+    return {
+        "pages": pages,
+        "model": "mistral-ocr-latest",
+        "usage_info": {"pages_processed": page_count, "doc_size_bytes": len(content)}
+    }
+
+
+class StandInState:
+    """In-memory store of uploaded files and batch jobs"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.files = {}
+        self.jobs = {}
+
+    def add_file(self, filename, content, purpose):
+        file_id = str(uuid.uuid4())
+        record = {
+            "id": file_id,
+            "object": "file",
+            "size_bytes": len(content),
+            "created_at": int(time.time()),
+            "filename": filename,
+            "purpose": purpose,
+            "sample_type": "batch_result" if purpose == "batch" else "ocr_input",
+            "source": "upload",
+            "num_lines": content.count(b"\n") if purpose == "batch" else None,
+        }
+        with self.lock:
+            self.files[file_id] = (record, content)
+        return record
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    state = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_json(self, payload, status=200):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_not_found(self):
+        self.send_json({"object": "error", "message": f"Not found: {self.path}"}, status=404)
+
+    def read_body(self):
+        length = int(self.headers.get("Content-Length", 0))
+        return self.rfile.read(length)
+
+    def resolve_document(self, document):
+        """Return (filename, content) for a document_url pointing back at this server"""
+        match = re.search(r"/v1/files/([^/]+)/content", document.get("document_url", ""))
+        if not match or match.group(1) not in self.state.files:
+            return None
+        record, content = self.state.files[match.group(1)]
+        return record["filename"], content
+
+    def run_ocr(self, body):
+        """Run synthetic OCR on a request body, returning (status_code, response_body)"""
+        resolved = self.resolve_document(body.get("document", {}))
+        if resolved is None:
+            return 422, {"object": "error", "message": "document_url must point at an uploaded file"}
+        filename, content = resolved
+        return 200, fake_ocr(filename, content, body.get("include_image_base64", False))
+
+    def do_GET(self):
+        path = urlparse(self.path).path
+
+        match = re.fullmatch(r"/v1/files/([^/]+)/url", path)
+        if match and match.group(1) in self.state.files:
+            host = self.headers.get("Host")
+            return self.send_json({"url": f"http://{host}/v1/files/{match.group(1)}/content"})
+
+        match = re.fullmatch(r"/v1/files/([^/]+)/content", path)
+        if match and match.group(1) in self.state.files:
+            _, content = self.state.files[match.group(1)]
+            self.send_response(200)
+            self.send_header("Content-Type", "application/octet-stream")
+            self.send_header("Content-Length", str(len(content)))
+            self.end_headers()
+            self.wfile.write(content)
+            return
+
+        match = re.fullmatch(r"/v1/batch/jobs/([^/]+)", path)
+        if match and match.group(1) in self.state.jobs:
+            job = self.state.jobs[match.group(1)]
+            # Report one RUNNING poll before completing, like a real queued job
+            if job["status"] == "QUEUED":
+                job["status"] = "RUNNING"
+                job["started_at"] = int(time.time())
+            elif job["status"] == "RUNNING":
+                job["status"] = "SUCCESS"
+                job["completed_at"] = int(time.time())
+                job["completed_requests"] = job["total_requests"]
+            return self.send_json(job)
+
+        self.send_not_found()
+
+    def do_POST(self):
+        path = urlparse(self.path).path
+        body = self.read_body()
+
+        if path == "/v1/files":
+            message = BytesParser(policy=HTTP).parsebytes(
+                b"Content-Type: " + self.headers["Content-Type"].encode("latin-1") + b"\r\n\r\n" + body
+            )
+            fields = {}
+            for part in message.iter_parts():
+                fields[part.get_param("name", header="content-disposition")] = (
+                    part.get_filename(), part.get_payload(decode=True)
+                )
+            filename, content = fields["file"]
+            purpose = fields.get("purpose", (None, b"ocr"))[1].decode("utf-8")
+            return self.send_json(self.state.add_file(filename, content, purpose))
+
+        if path == "/v1/ocr":
+            status, response = self.run_ocr(json.loads(body))
+            return self.send_json(response, status=status)
+
+        if path == "/v1/batch/jobs":
+            request = json.loads(body)
+            lines = []
+            for file_id in request.get("input_files", []):
+                _, content = self.state.files[file_id]
+                lines.extend(json.loads(line) for line in content.decode("utf-8").splitlines() if line.strip())
+
+            # Results are computed up front; polling only advances the status
+            output_lines = []
+            failed = 0
+            for line in lines:
+                status, response = self.run_ocr(line["body"])
+                failed += status != 200
+                output_lines.append(json.dumps({
+                    "id": str(uuid.uuid4()),
+                    "custom_id": line["custom_id"],
+                    "response": {"status_code": status, "body": response},
+                    "error": None
+                }))
+            output = self.state.add_file("batch_output.jsonl", "\n".join(output_lines).encode("utf-8"), "batch")
+
+            job_id = str(uuid.uuid4())
+            job = {
+                "id": job_id,
+                "object": "batch",
+                "input_files": request.get("input_files", []),
+                "endpoint": request["endpoint"],
+                "model": request.get("model"),
+                "metadata": request.get("metadata"),
+                "errors": [],
+                "status": "QUEUED",
+                "created_at": int(time.time()),
+                "total_requests": len(lines),
+                "completed_requests": 0,
+                "succeeded_requests": len(lines) - failed,
+                "failed_requests": failed,
+                "output_file": output["id"],
+                "error_file": None,
+            }
+            self.state.jobs[job_id] = job
+            return self.send_json(job)
+
+        self.send_not_found()
+
+
+def make_server(host="127.0.0.1", port=8765):
+    """Create (but do not start) a stand-in server; port 0 picks a free port"""
+    handler = type("BoundStandInHandler", (StandInHandler,), {"state": StandInState()})
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local stand-in for the Mistral OCR and batch APIs")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to bind (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8765, help="Port to listen on (default: 8765)")
+
+    args = parser.parse_args()
+
+    server = make_server(args.host, args.port)
+    print(f"🧪 Mistral stand-in server listening on http://{args.host}:{server.server_port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""
+Throughput and cost metrics for OCR runs.
+
+Each document (and each batch job) gets a record of stage timings, page counts,
+bytes moved and retries. Records are appended to a JSONL log as they complete
+and summarized at the end of the run.
+"""
+import json
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+
+
+def base64_payload_bytes(data_uri):
+    """Decoded size of a base64 data URI without decoding it"""
+    encoded = data_uri.split(",", 1)[-1]
+    return len(encoded) * 3 // 4 - encoded[-2:].count("=")
+
+
+def new_document_record(pdf_path, mode):
+    """Start a metrics record for one document processed in 'sync' or 'batch' mode"""
+    return {
+        "type": "document",
+        "document": str(pdf_path),
+        "mode": mode,
+        "status": "ok",
+        "error": None,
+        "pages": 0,
+        "pages_processed": 0,
+        "images": 0,
+        "bytes_uploaded": Path(pdf_path).stat().st_size if Path(pdf_path).is_file() else 0,
+        "bytes_downloaded": 0,
+        "image_bytes": 0,
+        "retries": 0,
+        "timings": {}
+    }
+
+def new_batch_record(document_count):
+    """Start a metrics record for one batch job"""
+    return {
+        "type": "batch",
+        "job_id": None,
+        "status": None,
+        "documents": document_count,
+        "succeeded": 0,
+        "failed": 0,
+        "request_file_bytes": 0,
+        "output_file_bytes": 0,
+        "retries": 0,
+        "timings": {}
+    }
+
+@contextmanager
+def timed(record, stage):
+    """Add the time spent in the block to record['timings'][stage]"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        record["timings"][stage] = round(record["timings"].get(stage, 0) + elapsed, 3)
+
+def record_response(record, ocr_response, response_bytes=None):
+    """Fill page, image and download counts from an OCRResponse.
+
+    response_bytes is the exact payload size when known (batch output lines);
+    otherwise the markdown plus base64 image text is used as an estimate.
+    """
+    record["pages"] = len(ocr_response.pages)
+    record["pages_processed"] = ocr_response.usage_info.pages_processed
+    estimated_bytes = 0
+    for page in ocr_response.pages:
+        estimated_bytes += len(page.markdown.encode("utf-8"))
+        for image in page.images:
+            record["images"] += 1
+            if image.image_base64:
+                estimated_bytes += len(image.image_base64)
+                record["image_bytes"] += base64_payload_bytes(image.image_base64)
+    record["bytes_downloaded"] = response_bytes if response_bytes is not None else estimated_bytes
+
+def mark_failed(record, error):
+    record["status"] = "failed"
+    record["error"] = str(error)
+
+
+class OCRMetrics:
+    """Collects the finished records for one run"""
+
+    def __init__(self, log_path=None):
+        self.log_path = Path(log_path) if log_path else None
+        self.records = []
+        self.started = time.perf_counter()
+
+    def log(self, record):
+        """Keep a finished record and append it to the JSONL log"""
+        record["logged_at"] = datetime.now(timezone.utc).isoformat()
+        self.records.append(record)
+        if self.log_path:
+            with open(self.log_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record) + "\n")
+
+    def summary(self):
+        """Aggregate totals across all records.
+
+        Batch output is attributed to its documents line by line, so only the
+        batch request file adds to the upload total at the batch level.
+        """
+        documents = [r for r in self.records if r["type"] == "document"]
+        stage_totals = {}
+        for record in self.records:
+            for stage, seconds in record["timings"].items():
+                stage_totals[stage] = stage_totals.get(stage, 0) + seconds
+
+        wall_seconds = time.perf_counter() - self.started
+        pages = sum(r["pages"] for r in documents)
+        ocr_seconds = stage_totals.get("ocr", 0)
+        return {
+            "documents": len(documents),
+            "failed": sum(r["status"] != "ok" for r in documents),
+            "batches": sum(r["type"] == "batch" for r in self.records),
+            "pages": pages,
+            "pages_processed": sum(r["pages_processed"] for r in documents),
+            "images": sum(r["images"] for r in documents),
+            "bytes_uploaded": sum(r.get("bytes_uploaded", r.get("request_file_bytes", 0)) for r in self.records),
+            "bytes_downloaded": sum(r["bytes_downloaded"] for r in documents),
+            "image_bytes": sum(r["image_bytes"] for r in documents),
+            "retries": sum(r["retries"] for r in self.records),
+            "stage_seconds": {stage: round(seconds, 3) for stage, seconds in stage_totals.items()},
+            "wall_seconds": round(wall_seconds, 3),
+            "pages_per_second": round(pages / wall_seconds, 3) if wall_seconds else 0,
+            "ocr_pages_per_second": round(pages / ocr_seconds, 3) if ocr_seconds else None
+        }
+
+    def print_summary(self):
+        summary = self.summary()
+        if not summary["documents"]:
+            return
+
+        print("\n📊 OCR run summary")
+        print(f"   - Documents: {summary['documents']} ({summary['failed']} failed)")
+        print(f"   - Pages: {summary['pages']} ({summary['pages_processed']} billed), "
+              f"images: {summary['images']}")
+        print(f"   - Uploaded: {summary['bytes_uploaded'] / 1e6:.1f} MB, "
+              f"downloaded: {summary['bytes_downloaded'] / 1e6:.1f} MB "
+              f"(images {summary['image_bytes'] / 1e6:.1f} MB)")
+        print(f"   - Retries: {summary['retries']}")
+        stages = ", ".join(f"{stage} {seconds:.1f}s" for stage, seconds in summary["stage_seconds"].items())
+        if stages:
+            print(f"   - Stage time: {stages}")
+        print(f"   - Wall time: {summary['wall_seconds']:.1f}s, {summary['pages_per_second']:.2f} pages/s")
+        if summary["ocr_pages_per_second"] is not None:
+            print(f"   - OCR stage: {summary['ocr_pages_per_second']:.2f} pages/s")
+        if self.log_path:
+            print(f"   - Metrics log: {self.log_path}")